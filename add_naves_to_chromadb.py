@@ -9,61 +9,327 @@ Safety improvements:
 - Optionally cleans up stray test collections
 """
 
+import argparse
+import functools
+import gc
+import hashlib
 import json
-import chromadb
-from chromadb.utils import embedding_functions
+import operator
+import os
+import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
+try:
+    # Optional: orjson decodes the large chunk files several times faster
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    # Optional: typed metadata normalisation
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover
+    msgspec = None
+
 # Resolve project root and add scripts/ to path for safety utilities
 ROOT = Path(__file__).resolve().parent
 SCRIPTS_DIR = ROOT / "scripts"
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.append(str(SCRIPTS_DIR))
 
-try:
-    # Optional: safety backup if available
-    from safety import backup_collection as _backup_collection  # type: ignore
-except Exception:  # pragma: no cover
-    _backup_collection = None
+
+def _load_backup_helper():
+    """Optional safety backup if available.
+
+    Imported on first use: safety.py pulls in chromadb, which must not load
+    just for --help.
+    """
+    try:
+        from safety import backup_collection  # type: ignore
+        return backup_collection
+    except Exception:  # pragma: no cover
+        return None
+
 
 VDB_PATH = str(ROOT / "vectordb")
 BACKUP_DIR = str(ROOT / "backups")
 
+# BGE-large (1024-dim) to match the existing TinyOwl database
+BGE_MODEL_NAME = 'BAAI/bge-large-en-v1.5'
+# Local copy of the model with an int8 dynamically quantized ONNX graph
+BGE_ONNX_DIR = ROOT / "models" / "bge-large-en-v1.5"
+BGE_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+# Distilled static (token-average) model for very short inputs, see --fast-scripture
+STATIC_MODEL_NAME = 'minishlab/potion-base-8M'
+
+# Encoder batch (matmul utilisation) vs. Chroma add() batch (per-call overhead);
+# each add() batch is embedded on its own, bounding memory to one batch
+EMBED_BATCH_SIZE = 256
+ADD_BATCH_SIZE = 1000
+
+# Inference threads: physical cores (assume 2-way SMT); oversubscribing
+# hyperthreads slows down int8 matmuls
+INFER_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+
+def _ort_session_options():
+    """ONNX Runtime session tuned for single-process batch encoding."""
+    import onnxruntime as ort
+
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.intra_op_num_threads = INFER_THREADS
+    so.inter_op_num_threads = 1
+    so.add_session_config_entry('session.disable_prepacking', '0')
+    return so
+
+
+def _local_model_path(model_name: str) -> str:
+    """Resolve a Hub model to its local snapshot, downloading only if not cached.
+
+    Re-runs then load straight from HF_HOME without any Hub round-trips.
+    """
+    try:
+        from huggingface_hub import snapshot_download
+    except ImportError:
+        return model_name
+    try:
+        return snapshot_download(model_name, local_files_only=True)
+    except Exception:
+        try:
+            return snapshot_download(model_name)
+        except Exception:
+            return model_name
+
+
+def _select_device() -> str:
+    """Best available torch device: CUDA (incl. ROCm), then Apple MPS, else CPU."""
+    try:
+        import torch
+    except ImportError:
+        return 'cpu'
+    if torch.cuda.is_available():
+        return 'cuda'
+    mps = getattr(torch.backends, 'mps', None)
+    if mps is not None and mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+
+class BGEEmbeddingFunction:
+    """Chroma embedding function for BGE-large.
+
+    On a GPU (CUDA/ROCm or MPS) runs the PyTorch model under FP16 autocast.
+    On CPU runs an int8 ONNX Runtime graph, exported once into BGE_ONNX_DIR
+    if it is not there yet, falling back to PyTorch when ONNX support is not
+    installed.
+    """
+
+    def __init__(self, model_name: str = BGE_MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.device = _select_device()
+
+        if self.device != 'cpu':
+            print(f"  ⚡ Encoding on {self.device} (fp16 autocast)")
+            self.model = SentenceTransformer(_local_model_path(model_name), device=self.device)
+            return
+
+        try:
+            if not (BGE_ONNX_DIR / BGE_ONNX_FILE).exists():
+                from sentence_transformers import export_dynamic_quantized_onnx_model
+                print(f"  ⚙️ Exporting int8 ONNX model to {BGE_ONNX_DIR} (one-time)...")
+                base = SentenceTransformer(_local_model_path(model_name), backend='onnx')
+                base.save(str(BGE_ONNX_DIR))
+                export_dynamic_quantized_onnx_model(base, 'avx512_vnni', str(BGE_ONNX_DIR))
+            self.model = SentenceTransformer(
+                str(BGE_ONNX_DIR),
+                backend='onnx',
+                model_kwargs={
+                    'file_name': BGE_ONNX_FILE,
+                    'session_options': _ort_session_options(),
+                },
+            )
+        except Exception as e:
+            print(f"  ⚠️ ONNX backend unavailable ({e}); using PyTorch")
+            try:
+                import torch
+                torch.set_num_threads(INFER_THREADS)
+            except Exception:
+                pass
+            self.model = SentenceTransformer(_local_model_path(model_name))
+
+    def _encode(self, documents: List[str]) -> np.ndarray:
+        return self.model.encode(
+            documents,
+            batch_size=EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+        )
+
+    def embed(self, documents: List[str]) -> np.ndarray:
+        """Encode one add() batch of documents (used for pre-computed ingestion)."""
+        if self.device == 'cpu':
+            return self._encode(documents)
+        import torch
+        try:
+            with torch.inference_mode(), torch.autocast(self.device, dtype=torch.float16):
+                return np.asarray(self._encode(documents), dtype=np.float32)
+        except RuntimeError:
+            # Some MPS ops have no fp16 kernel; redo the batch in fp32
+            with torch.inference_mode():
+                return self._encode(documents)
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self.model.encode(list(input), convert_to_numpy=True).tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def get_bge_encoder(model_name: str = BGE_MODEL_NAME) -> BGEEmbeddingFunction:
+    """Process-wide shared BGE encoder; every layer reuses the same instance."""
+    return BGEEmbeddingFunction(model_name)
+
+
+class StaticEmbeddingFunction:
+    """Chroma embedding function backed by a model2vec static model.
+
+    No transformer in the hot path; intended for the short verse-reference
+    strings in the scripture_entries layer. Vectors are not BGE-compatible,
+    so only use it for a whole collection.
+    """
+
+    def __init__(self, model_name: str = STATIC_MODEL_NAME):
+        from model2vec import StaticModel
+
+        self.model_name = model_name
+        self.model = StaticModel.from_pretrained(model_name)
+
+    def embed(self, documents: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(documents), dtype=np.float32)
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self.embed(list(input)).tolist()
+
+
+NAVES_LAYERS = ('scripture_entries', 'topic_entries', 'topic_sections', 'complete_topics')
+
+def _load_one(chunks_dir: Path, layer_name: str) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+    """Load a single layer file; returns (layer_name, None) if it is missing."""
+    file_path = chunks_dir / f"naves_{layer_name}.json"
+    if not file_path.exists():
+        return layer_name, None
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return layer_name, orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return layer_name, json.load(f)
+
 def load_naves_chunks() -> Dict[str, List[Dict[str, Any]]]:
     """Load all hierarchical Nave's chunks."""
     print("📖 Loading Nave's hierarchical chunks...")
 
     chunks_dir = Path("domains/theology/chunks")
 
-    layers = {
-        'scripture_entries': [],
-        'topic_entries': [],
-        'topic_sections': [],
-        'complete_topics': []
-    }
+    # Files are independent; overlap their I/O and decoding
+    with ThreadPoolExecutor(max_workers=len(NAVES_LAYERS)) as ex:
+        results = list(ex.map(lambda name: _load_one(chunks_dir, name), NAVES_LAYERS))
 
-    for layer_name in layers.keys():
-        file_path = chunks_dir / f"naves_{layer_name}.json"
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                layers[layer_name] = json.load(f)
-            print(f"  ✅ Loaded {len(layers[layer_name]):,} {layer_name}")
+    # Report after the join so output stays in layer order
+    layers: Dict[str, List[Dict[str, Any]]] = {}
+    for layer_name, data in results:
+        if data is None:
+            layers[layer_name] = []
+            print(f"  ❌ Missing {chunks_dir / f'naves_{layer_name}.json'}")
         else:
-            print(f"  ❌ Missing {file_path}")
+            layers[layer_name] = data
+            print(f"  ✅ Loaded {len(data):,} {layer_name}")
 
     return layers
 
-def add_to_chromadb(layers: Dict[str, List[Dict[str, Any]]]):
-    """Add Nave's chunks to ChromaDB with BGE-large embeddings."""
+if msgspec is not None:
+    # Metadata schemas as emitted by process_naves_*.py; unknown keys are dropped
+    class NavesTopicMeta(msgspec.Struct):
+        topic: Optional[str] = None
+        layer: Optional[str] = None
+        source: Optional[str] = None
+        topic_index: Optional[int] = None
+        content_length: Optional[int] = None
+
+    class NavesSectionMeta(NavesTopicMeta):
+        section_index: Optional[int] = None
+
+    class NavesEntryMeta(NavesTopicMeta):
+        entry_index: Optional[int] = None
+        scripture_reference: Optional[str] = None
+
+    _META_SCHEMAS = {
+        'scripture_entries': NavesEntryMeta,
+        'topic_entries': NavesEntryMeta,
+        'topic_sections': NavesSectionMeta,
+        'complete_topics': NavesTopicMeta,
+    }
+
+
+def _normalize_meta(layer_name: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce chunk metadata to the layer's primitive fields, dropping empty values."""
+    if msgspec is not None and layer_name in _META_SCHEMAS:
+        try:
+            meta = msgspec.structs.asdict(msgspec.convert(meta, _META_SCHEMAS[layer_name], strict=False))
+        except msgspec.ValidationError:
+            pass
+    return {k: v for k, v in meta.items()
+            if isinstance(v, (str, int, float, bool)) and v != ""}
+
+# Pulls all three chunk fields in one C-level call
+_chunk_fields = operator.itemgetter('id', 'document', 'metadata')
+
+def _chroma_id(chunk_id: str) -> str:
+    """Fixed-width (32 hex chars) Chroma id for a long human-readable chunk id.
+
+    The original id is kept in metadata as 'orig_id'; look chunks up by that.
+    """
+    return hashlib.blake2b(chunk_id.encode('utf-8'), digest_size=16).hexdigest()
+
+def _batched(chunks: Sequence[Dict[str, Any]], n: int, layer_name: str) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]]]]:
+    """Yield (chroma ids, documents, normalised metadatas) batches of up to n chunks."""
+    for i in range(0, len(chunks), n):
+        orig_ids, documents, metadatas = zip(*map(_chunk_fields, chunks[i:i + n]))
+        yield (
+            list(map(_chroma_id, orig_ids)),
+            list(documents),
+            [{**_normalize_meta(layer_name, meta), 'orig_id': cid} for meta, cid in zip(metadatas, orig_ids)],
+        )
+
+def _present_ids(collection, ids: List[str]) -> Set[str]:
+    """Return the subset of ids already stored in the collection."""
+    present: Set[str] = set()
+    for i in range(0, len(ids), ADD_BATCH_SIZE):
+        try:
+            present.update(collection.get(ids=ids[i:i + ADD_BATCH_SIZE], include=[])['ids'])
+        except Exception:
+            continue
+    return present
+
+def add_to_chromadb(layers: Dict[str, List[Dict[str, Any]]],
+                    bge_ef: BGEEmbeddingFunction,
+                    static_ef: Optional[StaticEmbeddingFunction] = None):
+    """Add Nave's chunks to ChromaDB with BGE-large embeddings.
+
+    Vectors are computed here and passed to Chroma explicitly, so collections
+    are created without an embedding function. If static_ef is given, the
+    scripture_entries layer uses it instead of BGE-large.
+    """
     print("🗃️ Adding to ChromaDB with BGE-large embeddings...")
 
-    # Use BGE-large to match existing TinyOwl database
-    bge_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name='BAAI/bge-large-en-v1.5'
-    )
+    import chromadb
 
+    _backup_collection = _load_backup_helper()
     client = chromadb.PersistentClient(path=VDB_PATH)
 
     for layer_name, chunks in layers.items():
@@ -73,6 +339,12 @@ def add_to_chromadb(layers: Dict[str, List[Dict[str, Any]]]):
         collection_name = f"naves_{layer_name}"
         print(f"\\n📦 Processing {collection_name}...")
 
+        ef = static_ef if (static_ef is not None and layer_name == 'scripture_entries') else bge_ef
+        collection_meta = {
+            "description": f"Nave's Topical Bible - {layer_name}",
+            "embedding_model": ef.model_name,
+        }
+
         # Create or get collection
         try:
             collection = client.get_collection(collection_name)
@@ -82,58 +354,55 @@ def add_to_chromadb(layers: Dict[str, List[Dict[str, Any]]]):
             except Exception:
                 existing = 0
             print(f"  ⚠️ Collection exists with {existing:,} items")
-            # If already up-to-date, skip re-embedding
-            if existing == len(chunks):
-                print(f"  ✅ Up-to-date, skipping {collection_name}")
-                continue
-            # Backup then recreate
-            if _backup_collection is not None and existing:
-                try:
-                    backup_path = _backup_collection(VDB_PATH, collection_name, BACKUP_DIR)
-                    print(f"  🔒 Backup created: {backup_path}")
-                except Exception as e:
-                    print(f"  ⚠️ Backup failed ({e}); proceeding with caution")
-            print(f"  🔄 Recreating {collection_name} for complete embedding")
-            client.delete_collection(collection_name)
-            collection = client.create_collection(
-                name=collection_name,
-                embedding_function=bge_ef,
-                metadata={"description": f"Nave's Topical Bible - {layer_name}"}
-            )
+            # Same embedder: only embed chunks whose ids are not stored yet
+            stored_model = (collection.metadata or {}).get("embedding_model", BGE_MODEL_NAME)
+            present: Set[str] = set()
+            if existing and stored_model == ef.model_name:
+                present = _present_ids(collection, [_chroma_id(c['id']) for c in chunks])
+            if present:
+                chunks = [c for c in chunks if _chroma_id(c['id']) not in present]
+                if not chunks:
+                    print(f"  ✅ Up-to-date, skipping {collection_name}")
+                    continue
+                print(f"  ➕ {len(present):,} already embedded; adding {len(chunks):,} new chunks")
+            else:
+                # Nothing reusable (different embedder or stale ids): backup then recreate
+                if _backup_collection is not None and existing:
+                    try:
+                        backup_path = _backup_collection(VDB_PATH, collection_name, BACKUP_DIR)
+                        print(f"  🔒 Backup created: {backup_path}")
+                    except Exception as e:
+                        print(f"  ⚠️ Backup failed ({e}); proceeding with caution")
+                print(f"  🔄 Recreating {collection_name} for complete embedding")
+                client.delete_collection(collection_name)
+                collection = client.create_collection(
+                    name=collection_name,
+                    embedding_function=None,
+                    metadata=collection_meta
+                )
 
         except Exception:
             collection = client.create_collection(
                 name=collection_name,
-                embedding_function=bge_ef,
-                metadata={"description": f"Nave's Topical Bible - {layer_name}"}
+                embedding_function=None,
+                metadata=collection_meta
             )
             print(f"  ✅ Created new collection")
 
-        # Prepare data for ChromaDB
-        ids = []
-        documents = []
-        metadatas = []
-
-        for chunk in chunks:
-            ids.append(chunk['id'])
-            documents.append(chunk['document'])
-            metadatas.append(chunk['metadata'])
-
-        # Add in batches for large collections
-        batch_size = 100
+        # Stream batches straight from the chunk list; only one batch of
+        # ids/documents/metadatas/embeddings is alive at a time
+        batch_size = ADD_BATCH_SIZE
         total_batches = (len(chunks) + batch_size - 1) // batch_size
 
-        print(f"  📊 Adding {len(chunks):,} chunks in {total_batches} batches...")
-
-        for i in range(0, len(chunks), batch_size):
-            batch_end = min(i + batch_size, len(chunks))
-            batch_num = (i // batch_size) + 1
+        print(f"  📊 Embedding + adding {len(chunks):,} chunks in {total_batches} batches...")
 
+        for batch_num, (ids_b, docs_b, metas_b) in enumerate(_batched(chunks, batch_size, layer_name), start=1):
             try:
                 collection.add(
-                    ids=ids[i:batch_end],
-                    documents=documents[i:batch_end],
-                    metadatas=metadatas[i:batch_end]
+                    ids=ids_b,
+                    documents=docs_b,
+                    metadatas=metas_b,
+                    embeddings=ef.embed(docs_b).tolist()
                 )
 
                 if batch_num % 10 == 0 or batch_num == total_batches:
@@ -150,6 +419,10 @@ def verify_integration():
     """Verify Nave's integration with existing TinyOwl database."""
     print("\\n🔍 Verifying TinyOwl + Nave's integration...")
 
+    # Only chromadb is needed here, not the sentence-transformers stack
+    import chromadb
+
+    _backup_collection = _load_backup_helper()
     client = chromadb.PersistentClient(path=VDB_PATH)
     collections = client.list_collections()
 
@@ -184,14 +457,29 @@ def verify_integration():
 
 def main():
     """Main integration function."""
+    ap = argparse.ArgumentParser(description="Add Nave's Topical Bible chunks to ChromaDB")
+    ap.add_argument("--fast-scripture", action="store_true",
+                    help=f"Embed scripture_entries with the static {STATIC_MODEL_NAME} model instead of BGE-large")
+    args = ap.parse_args()
+
     print("🦉 TinyOwl: Adding Nave's Topical Bible to ChromaDB")
     print("=" * 55)
 
     # Load chunks
     layers = load_naves_chunks()
 
+    # Load encoders once and share them across all layers
+    # (BGE-large to match existing TinyOwl database; fp16 on GPU, int8 ONNX on CPU)
+    bge_ef = get_bge_encoder()
+    static_ef = StaticEmbeddingFunction() if args.fast_scripture else None
+
     # Add to ChromaDB
-    add_to_chromadb(layers)
+    add_to_chromadb(layers, bge_ef, static_ef)
+
+    # Release model weights before verification
+    del bge_ef, static_ef
+    get_bge_encoder.cache_clear()
+    gc.collect()
 
     # Verify integration
     verify_integration()
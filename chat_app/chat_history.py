@@ -1,22 +1,98 @@
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime
 
 from .config import HISTORY_DB_PATH
 
 
+# Statements issued on the interactive path. sqlite3 keeps a per-connection
+# cache of prepared statements keyed by SQL text, so each is compiled once.
+_INSERT_MESSAGE = "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)"
+_INSERT_SESSION = "INSERT INTO sessions (created_at, ai_enabled, ai_model) VALUES (?, ?, ?)"
+_SELECT_MESSAGES = "SELECT role, content, created_at FROM messages WHERE session_id = ? ORDER BY id"
+_UPDATE_AI_ENABLED = "UPDATE sessions SET ai_enabled = ? WHERE id = ?"
+_UPDATE_AI_MODEL = "UPDATE sessions SET ai_model = ? WHERE id = ?"
+
+
 class ChatHistory:
-    def __init__(self, db_path: Path = HISTORY_DB_PATH):
+    def __init__(self, db_path: Path = HISTORY_DB_PATH, flush_every: int = 25):
         self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection in autocommit mode; each statement is its own
+        # transaction unless wrapped in an explicit BEGIN/COMMIT.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;"
+            # Read pages through a memory map, and keep up to 64 MiB of them cached
+            " PRAGMA mmap_size=268435456; PRAGMA cache_size=-65536;"
+        )
+        self._lock = threading.Lock()
+        # Write-behind buffer for messages; flushed in one transaction at the end
+        # of each REPL turn, or early once flush_every are pending
+        self._pending: List[Tuple[int, str, str, str]] = []
+        self._flush_every = flush_every
+        self._closed = False
+        # Cached created_at string, refreshed at most once per second
+        self._ts_second = -1
+        self._ts_text = ""
         self._ensure_db()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._closed = True
+
+    def flush(self) -> bool:
+        """Write any buffered messages to the database; False if they are still pending."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _timestamp(self) -> str:
+        """UTC ISO timestamp at one-second resolution, formatted once per second."""
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts_text = datetime.utcfromtimestamp(now).isoformat()
+        return self._ts_text
+
+    def _flush_locked(self) -> bool:
+        """Write pending messages in one transaction; False if the write failed.
+
+        On failure (database locked by another instance, disk full, ...) the
+        transaction is rolled back so the connection is usable again, and the
+        messages stay pending for the next flush.
+        """
+        if not self._pending:
+            return True
+        cur = self._conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            cur.executemany(_INSERT_MESSAGE, self._pending)
+            cur.execute("COMMIT")
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                try:
+                    self._conn.rollback()
+                except sqlite3.Error:
+                    pass
+            return False
+        self._pending.clear()
+        return True
 
     def _ensure_db(self) -> None:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -44,66 +120,69 @@ class ChatHistory:
                 )
                 """
             )
-            conn.commit()
-
-    def create_session(self, ai_enabled: bool, ai_model: Optional[str] = None) -> int:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
+            # Serves get_session_messages as an index range scan with no sort.
+            # recent_sessions needs no index: ORDER BY id DESC walks the rowid.
             cur.execute(
-                "INSERT INTO sessions (created_at, ai_enabled, ai_model) VALUES (?, ?, ?)",
-                (datetime.utcnow().isoformat(), 1 if ai_enabled else 0, ai_model),
+                "CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages(session_id, id)"
             )
-            conn.commit()
+            cur.execute("COMMIT")
+
+    def create_session(self, ai_enabled: bool, ai_model: Optional[str] = None) -> int:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute(_INSERT_SESSION, (self._timestamp(), 1 if ai_enabled else 0, ai_model))
             return cur.lastrowid
 
     def add_message(self, session_id: int, role: str, content: str) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)",
-                (session_id, role, content, datetime.utcnow().isoformat()),
-            )
-            conn.commit()
+        """Buffer a message until the next flush(), or until flush_every are pending."""
+        with self._lock:
+            self._pending.append((session_id, role, content, self._timestamp()))
+            if len(self._pending) >= self._flush_every:
+                self._flush_locked()
+
+    def add_messages(self, messages: Iterable[Tuple[int, str, str]]) -> None:
+        """Write (session_id, role, content) rows in a single transaction."""
+        with self._lock:
+            ts = self._timestamp()
+            self._pending.extend((sid, role, content, ts) for sid, role, content in messages)
+            self._flush_locked()
 
     def recent_sessions(self, limit: int = 5) -> List[Tuple[int, str, bool]]:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
+        with self._lock:
+            cur = self._conn.execute(
                 "SELECT id, created_at, ai_enabled FROM sessions ORDER BY id DESC LIMIT ?",
                 (limit,),
             )
             return [(row[0], row[1], bool(row[2])) for row in cur.fetchall()]
 
     def get_session_messages(self, session_id: int):
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT role, content, created_at FROM messages WHERE session_id = ? ORDER BY id",
-                (session_id,),
-            )
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute(_SELECT_MESSAGES, (session_id,))
             return [(row[0], row[1], row[2]) for row in cur.fetchall()]
 
+    def iter_session_messages(self, session_id: int, batch: int = 500) -> Iterator[Tuple[str, str, str]]:
+        """Yield (role, content, created_at) rows in order without materializing the session."""
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute(_SELECT_MESSAGES, (session_id,))
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            yield from rows
+
     def update_session_ai_enabled(self, session_id: int, ai_enabled: bool) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "UPDATE sessions SET ai_enabled = ? WHERE id = ?",
-                (1 if ai_enabled else 0, session_id),
-            )
-            conn.commit()
+        with self._lock:
+            self._conn.execute(_UPDATE_AI_ENABLED, (1 if ai_enabled else 0, session_id))
 
     def update_session_ai_model(self, session_id: int, ai_model: Optional[str]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "UPDATE sessions SET ai_model = ? WHERE id = ?",
-                (ai_model, session_id),
-            )
-            conn.commit()
+        with self._lock:
+            self._conn.execute(_UPDATE_AI_MODEL, (ai_model, session_id))
 
     def get_session_ai_model(self, session_id: int) -> Optional[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT ai_model FROM sessions WHERE id = ?", (session_id,))
+        with self._lock:
+            cur = self._conn.execute("SELECT ai_model FROM sessions WHERE id = ?", (session_id,))
             row = cur.fetchone()
             return row[0] if row and row[0] is not None else None
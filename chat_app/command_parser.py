@@ -1,28 +1,79 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Callable, Mapping, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedCommand:
     kind: str  # 'at', 'amp', 'hash', 'slash', 'bang', 'tilde', 'text'
     value: str
 
 
+# Leading character -> command kind; anything else is plain text
+_PREFIX: dict[str, str] = {
+    "/": "slash",
+    "!": "bang",
+    "@": "at",
+    "&": "amp",
+    "#": "hash",
+    "~": "tilde",
+}
+
+
+# Raw lines whose (handler, value) resolution a dispatcher remembers (FIFO)
+DISPATCH_CACHE_SIZE = 512
+
+
 def parse_command(line: str) -> ParsedCommand:
     s = (line or "").strip()
     if not s:
         return ParsedCommand(kind="text", value="")
-    if s.startswith("/"):
-        return ParsedCommand(kind="slash", value=s[1:].strip())
-    if s.startswith("!"):
-        return ParsedCommand(kind="bang", value=s[1:].strip())
-    if s.startswith("@"):
-        return ParsedCommand(kind="at", value=s[1:].strip())
-    if s.startswith("&"):
-        return ParsedCommand(kind="amp", value=s[1:].strip())
-    if s.startswith("#"):
-        return ParsedCommand(kind="hash", value=s[1:].strip())
-    if s.startswith("~"):
-        return ParsedCommand(kind="tilde", value=s[1:].strip())
-    return ParsedCommand(kind="text", value=s)
+    kind = _PREFIX.get(s[0])
+    if kind is None:
+        return ParsedCommand(kind="text", value=s)
+    return ParsedCommand(kind=kind, value=s[1:].strip())
+
+
+# Leading letters of an @H175 / @G3056 Strong's reference
+_STRONGS_PREFIXES = frozenset("HhGg")
+
+
+def parse_strongs_ref(value: str) -> Optional[str]:
+    """Strong's number in an '@' value ("strong:175", "H175", "g3056"), else None.
+
+    Slices only, no case-folded copies. An H/G prefix counts only before
+    digits, so words such as "hope" or "grace" are not Strong's references.
+    """
+    if value[:7].lower() == "strong:":
+        return value[7:].strip()
+    if value[:1] in _STRONGS_PREFIXES and value[1:].isdigit():
+        return value
+    return None
+
+
+def build_dispatcher(handlers: Mapping[str, Callable[[str], None]]) -> Callable[[str], None]:
+    """Fuse parse_command and the handler lookup: one dict probe per line.
+
+    handlers maps each parse_command kind to a callable taking the value. The
+    leading character maps straight to its handler, so no ParsedCommand is
+    built; lines without a known prefix go to handlers["text"]. Repeated lines
+    ("/ai status", "/help") reuse their resolution from a bounded cache.
+    """
+    by_prefix = {ch: handlers[kind] for ch, kind in _PREFIX.items()}
+    on_text = handlers["text"]
+    resolved: dict[str, tuple[Callable[[str], None], str]] = {}
+
+    def dispatch(line: str) -> None:
+        hit = resolved.get(line)
+        if hit is None:
+            s = (line or "").strip()
+            handler = by_prefix.get(s[:1])
+            hit = (on_text, s) if handler is None else (handler, s[1:].strip())
+            if len(resolved) >= DISPATCH_CACHE_SIZE:
+                del resolved[next(iter(resolved))]
+            resolved[line] = hit
+        handler, value = hit
+        handler(value)
+
+    return dispatch
@@ -2,8 +2,11 @@ from pathlib import Path
 import os
 
 
-# Resolve project root (tinyowl/) from this file's location (tinyowl/chat_app)
-ROOT: Path = Path(__file__).resolve().parents[1]
+# Resolve project root (tinyowl/) from this file's location (tinyowl/chat_app).
+# Computed once as a plain string (no Path.resolve() stat walk); string consumers
+# such as sys.path can use ROOT_STR directly.
+ROOT_STR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT: Path = Path(ROOT_STR)
 
 # Core paths
 DB_PATH: Path = ROOT / "vectordb"
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from pathlib import Path
+import heapq
 import json
+import pickle
 import sys
 
 import os
 import re
+import threading
+import time
 
 import numpy as np
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
+try:
+    import faiss  # type: ignore
+except ImportError:  # pragma: no cover - optional static-collection backend
+    faiss = None
+try:
+    import hyperscan  # type: ignore
+except ImportError:  # pragma: no cover - optional literal matcher for corpus scans
+    hyperscan = None
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover - optional physical core count
+    psutil = None
+
 from .config import (
     DB_PATH,
+    ROOT_STR,
     KJV_VERSES_JSON,
     WEB_VERSES_JSON,
     STRONGS_NUMBERS_JSON,
@@ -21,12 +51,386 @@ from .config import (
 
 
 # Make scripts/ importable for RetrievalRouter
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.append(str(ROOT))
+if ROOT_STR not in sys.path:
+    sys.path.append(ROOT_STR)
 from scripts.retrieval_router import RetrievalRouter  # type: ignore
 
 
+@lru_cache(maxsize=1)
+def _get_router() -> RetrievalRouter:
+    """Process-wide router; it holds no per-query state after construction."""
+    return RetrievalRouter()
+
+
+# Same embedding model as ingestion (BGE-large, 1024-dim)
+EMBEDDING_MODEL_NAME = "BAAI/bge-large-en-v1.5"
+
+# Query embeddings kept per DatabaseManager (LRU); repeat queries skip BGE entirely
+EMBED_CACHE_SIZE = 1024
+# Sentences per forward pass when encode_many() has several misses
+ENCODE_BATCH_SIZE = 32
+# Per-collection query results (LRU + TTL); the router re-asks the same collections
+RESULT_CACHE_SIZE = 512
+# Cross-encoder scores by (query, passage); follow-ups often rerank the same hits
+RERANK_CACHE_SIZE = 2048
+RESULT_CACHE_TTL = 300.0  # seconds
+# Collections reported by stats() and preloaded by warm()
+COLLECTION_NAMES = (
+    "kjv_verses", "kjv_pericopes", "kjv_chapters",
+    "web_verses", "web_pericopes", "web_chapters",
+    "strongs_concordance_entries",
+    "sop_paragraphs", "sop_chapters",
+)
+# Collection counts in stats() are reused for this long (seconds); set
+# TINYOWL_STATS_REFRESH=1 to refresh them on a background timer instead
+STATS_TTL = 60.0
+# Concurrent Chroma queries when one query fans out over several collections
+QUERY_WORKERS = 4
+# Compute threads for CPU inference: one per physical core (SMT siblings only
+# contend for the same SIMD units); TINYOWL_CPU_THREADS overrides
+CPU_THREADS = int(os.environ.get("TINYOWL_CPU_THREADS") or 0) or (
+    (psutil.cpu_count(logical=False) if psutil is not None else None) or os.cpu_count() or 1
+)
+# Must be set before torch / tokenizers are first imported to take effect;
+# Rust tokenizer threads would otherwise fight the BLAS pool
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(CPU_THREADS))
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+# Word tokens for the lexical_search inverted index
+_TOKEN_RE = re.compile(r"[a-z']+")
+# Word summaries ("Word 'FAITH' — ... Top Strong's: Hxxxx, Gxxxx"), both parts in one pass
+_WORD_TOP_RE = re.compile(r"Word\s+'([^']+)'.*?Top Strong's:\s*([HG]\d+(?:\s*,\s*[HG]?\d+)*)", re.S)
+# Strong's lemma + transliteration line (e.g., "1813 exaleipho ex-al-i'-fo")
+_LEMMA_RE = re.compile(r"^(\d+)\s+([A-Za-z][A-Za-z\-']*)\s+(.+)$")
+# concept_word_search expressions: signed terms, inner +/- splits, term cleanup
+_CONCEPT_TERM_RE = re.compile(r'([+-]?)\s*([^,]+)')
+_SIGN_SPLIT_RE = re.compile(r'([+-])')
+_CLEAN_RE = re.compile(r"[^A-Za-z0-9'\-]+")
+
+# CPU inference: BGE-large exported once as a dynamically int8-quantized ONNX graph
+INT8_MODEL_DIR = Path(os.path.expanduser("~/.cache/tinyowl/bge-large-int8"))
+INT8_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Cross-encoder reranker; int8 ONNX on CPU like the embedder
+RERANKER_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RERANKER_INT8_DIR = Path(os.path.expanduser("~/.cache/tinyowl/ms-marco-minilm-int8"))
+# (query, passage) pairs are truncated to this many tokens by the tokenizer;
+# passages are first pre-cut to a char bound well past that window, which keeps
+# cache keys and tokenizer input small without cutting inside it
+RERANK_MAX_TOKENS = 256
+RERANK_MAX_CHARS = RERANK_MAX_TOKENS * 8
+
+
+# Bump when the pickled lookup layout changes so stale side files are ignored
+LOOKUP_CACHE_VERSION = 7
+
+# JSON lists above this size are streamed item by item (when ijson is installed)
+STREAM_JSON_BYTES = 50 * 1024 * 1024
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open() as f:
+        return json.load(f)
+
+
+def _iter_json_items(path: Path, key: Optional[str] = None):
+    """Yield the items of a JSON list, top-level or under key; large files are streamed."""
+    if ijson is not None and path.stat().st_size > STREAM_JSON_BYTES:
+        with path.open("rb") as f:
+            yield from ijson.items(f, f"{key}.item" if key else "item", use_float=True)
+        return
+    data = _read_json(path)
+    yield from (data.get(key) or [] if key else data)
+
+
+def _cache_path(src: Path) -> Path:
+    """Pickled lookup map stored next to its source JSON."""
+    return src.with_suffix(f".v{LOOKUP_CACHE_VERSION}.pkl")
+
+
+def _prefetch(path: Path) -> None:
+    """Ask the kernel to start reading path into the page cache (no-op without fadvise)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _cached_load(src: Path, build) -> Any:
+    """Return build(src), reusing the pickle side file while it is newer than src."""
+    cache = _cache_path(src)
+    try:
+        if cache.exists() and cache.stat().st_mtime >= src.stat().st_mtime:
+            with cache.open("rb") as f:
+                return pickle.load(f)
+    except Exception:
+        pass
+    data = build(src)
+    try:
+        tmp = cache.with_suffix(".pkl.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(data, f, protocol=5)
+        os.replace(tmp, cache)
+    except Exception:
+        # Read-only data dir etc.; the JSON path still works
+        pass
+    return data
+
+
+def _strongs_map(path: Path) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for item in _iter_json_items(path):
+        sn = item.get("metadata", {}).get("strong_number")
+        if sn:
+            out[sn.upper()] = item
+    return out
+
+
+def _parse_strongs_entry(key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Lemma, transliteration and a short definition snippet for one Strong's entry."""
+    content = (entry.get("content") or "").strip()
+    # Prefer definition block before '---'
+    def_block = content.split("---", 1)[0].strip()
+
+    # Attempt to parse lemma + transliteration line (e.g., "1813 exaleipho ex-al-i'-fo")
+    lemma = ""
+    translit = ""
+    lines = [ln.strip() for ln in def_block.splitlines() if ln.strip()]
+    # Find a line that starts with a number then words
+    for ln in lines:
+        m = _LEMMA_RE.match(ln)
+        if m:
+            lemma = m.group(2)
+            translit = m.group(3).strip()
+            break
+
+    language = "Hebrew" if key.startswith('H') else ("Greek" if key.startswith('G') else "")
+
+    # Build a concise definition snippet (first 1-3 lines after lemma line)
+    snippet_lines: List[str] = []
+    started = False
+    for ln in lines:
+        if not started:
+            # Skip until after lemma line
+            if lemma and lemma in ln:
+                started = True
+            continue
+        # Stop at next header-style line or if we have enough
+        if len(snippet_lines) >= 3:
+            break
+        snippet_lines.append(ln)
+    snippet = " ".join(snippet_lines).strip() or def_block
+
+    return {
+        "number": key,
+        "language": language,
+        "lemma": lemma,
+        "transliteration": translit,
+        "definition": snippet,
+    }
+
+
+def _strongs_tables(path: Path) -> tuple:
+    """(strongs_by_num, display fields per number) for the Strong's numbers file."""
+    by_num = _strongs_map(path)
+    parsed = {key: _parse_strongs_entry(key, entry) for key, entry in by_num.items() if entry}
+    return by_num, parsed
+
+
+def _word_summary_maps(path: Path) -> tuple:
+    """(word -> Strong's numbers, word -> summary text) from the word summaries file.
+
+    Numbers are interned and stored as tuples: the same few thousand numbers
+    recur across words, and pickling keeps the sharing in the side cache.
+    """
+    word_to_strongs: Dict[str, Tuple[str, ...]] = {}
+    word_summary_docs: Dict[str, str] = {}
+    try:
+        for item in _iter_json_items(path):
+            content = (item.get("content") or "").strip()
+            # Expect patterns like: "Word 'FAITH' — ... Top Strong's: Hxxxx, Gxxxx"
+            m = _WORD_TOP_RE.search(content)
+            if m:
+                w = m.group(1).strip().upper()
+                # Normalize to include H/G prefix
+                norm = []
+                for n in m.group(2).split(','):
+                    n = n.strip().upper()
+                    if not n:
+                        continue
+                    if n[0] not in ('H','G'):
+                        n = 'H' + n
+                    norm.append(sys.intern(n))
+                if norm:
+                    word_to_strongs[w] = tuple(norm)
+                if content:
+                    word_summary_docs[w] = content
+    except Exception:
+        # Non-fatal; keep what parsed
+        pass
+    return word_to_strongs, word_summary_docs
+
+
+# Words never offered as semantic neighbours
+_STOP_WORDS = frozenset({
+    "the", "and", "of", "to", "in", "a", "is", "that", "it", "for",
+    "be", "with", "as", "by", "on", "not", "he", "this", "from",
+    "but", "they", "have", "was", "his", "which", "their", "said",
+    "if", "will", "all", "were", "when", "there", "been", "has",
+    "or", "an", "had", "are", "you", "her", "them", "him", "me",
+    "my", "i", "she", "your", "we", "so", "at", "one", "into",
+})
+
+
+def _word_similarities(results: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Lowercased candidate words and 1/(1+dist) similarities from a word-summary query."""
+    metas = (results.get("metadatas") or [[]])[0]
+    dists = (results.get("distances") or [[]])[0]
+    words = np.array([(m or {}).get("word", "").lower().strip() for m in metas], dtype=object)
+    sims = np.reciprocal(1.0 + np.asarray(dists, dtype=np.float64))
+    return words, sims
+
+
+def _top_words(words: np.ndarray, sims: np.ndarray, limit: int) -> List[Tuple[str, float]]:
+    """Best similarity per distinct word, highest first, at most limit words.
+
+    At a few hundred candidates a dict pass plus an O(n log k) heap beats
+    np.unique, which sorts the object array with Python comparisons.
+    """
+    best: Dict[str, float] = {}
+    for word, sim in zip(words.tolist(), sims.tolist()):
+        if sim > best.get(word, -1.0):
+            best[word] = sim
+    return heapq.nlargest(limit, best.items(), key=itemgetter(1))
+
+
+def _load_faiss_collection(db_path: Path, name: str) -> Optional[tuple]:
+    """(index, payload) written by scripts/export_faiss.py, or None if absent."""
+    path = Path(db_path) / f"{name}.faiss"
+    if faiss is None or not path.exists():
+        return None
+    try:
+        try:
+            index = faiss.read_index(str(path), faiss.IO_FLAG_MMAP)
+        except Exception:
+            # Not every index type supports mmap
+            index = faiss.read_index(str(path))
+        with path.with_suffix(".meta.pkl").open("rb") as f:
+            payload = pickle.load(f)
+        return index, payload
+    except Exception:
+        return None
+
+
+# Query embeddings are unit-normalized, so each distance space maps back to cosine
+# similarity: cosine/ip report 1 - cos, squared L2 reports 2 - 2*cos
+_SCORE_FROM_DISTANCE = {
+    "cosine": lambda d: 1.0 - d,
+    "ip": lambda d: 1.0 - d,
+    "l2": lambda d: 1.0 - d / 2.0,
+}
+
+
+def _faiss_query(index: Any, payload: Dict[str, Any], emb: np.ndarray, k: int) -> Dict[str, Any]:
+    """Search a FAISS export; returns a Chroma-shaped query result."""
+    q = np.array(emb, dtype=np.float32).reshape(1, -1)
+    space = payload.get("space", "l2")
+    if space == "cosine":
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+    scores, rows = index.search(q, k)
+    keep = rows[0] >= 0
+    rows, scores = rows[0][keep], scores[0][keep]
+    # Report the distance Chroma would: squared L2, else 1 - inner product
+    dists = scores if space == "l2" else 1.0 - scores
+    return {
+        "documents": [[payload["documents"][r] for r in rows]],
+        "metadatas": [[payload["metadatas"][r] for r in rows]],
+        "ids": [[payload["ids"][r] for r in rows]],
+        "distances": [dists.tolist()],
+    }
+
+
+def _load_int8_embedding_model() -> Optional[Any]:
+    """Load BGE-large as an int8 ONNX Runtime model for CPU, exporting it on first use.
+
+    Quantization is dynamic and per-channel with the AVX-512 VNNI config.
+    Returns a SentenceTransformer (same encode() API), or None if ONNX
+    Runtime / optimum are not installed.
+    """
+    try:
+        import onnxruntime as ort  # type: ignore
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model  # type: ignore
+
+        if not (INT8_MODEL_DIR / INT8_MODEL_FILE).exists():
+            base = SentenceTransformer(EMBEDDING_MODEL_NAME, backend="onnx")
+            base.save(str(INT8_MODEL_DIR))
+            export_dynamic_quantized_onnx_model(base, "avx512_vnni", str(INT8_MODEL_DIR))
+        return SentenceTransformer(
+            str(INT8_MODEL_DIR),
+            backend="onnx",
+            model_kwargs={"file_name": INT8_MODEL_FILE, "session_options": _ort_session_options(ort)},
+        )
+    except Exception:
+        return None
+
+
+def _ort_session_options(ort: Any) -> Any:
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.intra_op_num_threads = CPU_THREADS
+    return so
+
+
+def _load_reranker(device: str) -> Optional[Any]:
+    """Cross-encoder for reranking: int8 ONNX on CPU, fp16 on GPU; None if unavailable."""
+    try:
+        from sentence_transformers import CrossEncoder  # type: ignore
+    except Exception:
+        return None
+    if device == "cpu":
+        try:
+            import onnxruntime as ort  # type: ignore
+            from sentence_transformers import export_dynamic_quantized_onnx_model  # type: ignore
+
+            if not (RERANKER_INT8_DIR / INT8_MODEL_FILE).exists():
+                base = CrossEncoder(RERANKER_MODEL_NAME, backend="onnx", max_length=RERANK_MAX_TOKENS)
+                base.save(str(RERANKER_INT8_DIR))
+                export_dynamic_quantized_onnx_model(base, "avx512_vnni", str(RERANKER_INT8_DIR))
+            return CrossEncoder(
+                str(RERANKER_INT8_DIR),
+                backend="onnx",
+                max_length=RERANK_MAX_TOKENS,
+                model_kwargs={"file_name": INT8_MODEL_FILE, "session_options": _ort_session_options(ort)},
+            )
+        except Exception:
+            pass
+    else:
+        try:
+            import torch  # type: ignore
+            return CrossEncoder(
+                RERANKER_MODEL_NAME, device=device, max_length=RERANK_MAX_TOKENS,
+                model_kwargs={"torch_dtype": torch.float16},
+            )
+        except Exception:
+            pass
+    try:
+        return CrossEncoder(RERANKER_MODEL_NAME, max_length=RERANK_MAX_TOKENS)
+    except Exception:
+        return None
+
+
 @dataclass
 class ConcordanceResult:
     source: str
@@ -35,40 +439,168 @@ class ConcordanceResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class VerseTable:
+    """One translation's verse cache as parallel arrays (row i is one verse)."""
+    ids: np.ndarray         # osis ids
+    text: np.ndarray        # verse content (object)
+    metadata: np.ndarray    # metadata dicts (object)
+    id_to_idx: Dict[str, int]
+    # lexical_search index: the vocabulary as one NUL-separated buffer (with
+    # each word's start offset) and the row indices per word in the same order,
+    # plus all casefolded texts in one NUL-separated buffer with each row's
+    # [start, end) span
+    vocab: str
+    vocab_offsets: np.ndarray
+    postings: List[np.ndarray]
+    corpus: str
+    offsets: np.ndarray
+    ends: np.ndarray
+    # UTF-8 corpus and byte offsets for Hyperscan, built on first use
+    corpus_bytes: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def utf8_corpus(self) -> tuple:
+        if self.corpus_bytes is None:
+            data = self.corpus.encode()
+            # Each row starts just after a NUL separator
+            nuls = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0) + 1
+            offsets = np.concatenate(([0], nuls)).astype(np.int64) if len(self) else np.zeros(0, dtype=np.int64)
+            self.corpus_bytes = (data, offsets)
+        return self.corpus_bytes
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _verse_table(path: Path) -> VerseTable:
+    # Keep only the fields the table needs while streaming, not whole chunks
+    by_id = {c["osis_id"]: (c.get("content") or "", c.get("metadata", {})) for c in _iter_json_items(path, "chunks")}
+    ids = list(by_id)
+    text = [by_id[i][0] for i in ids]
+    lower = [t.casefold() for t in text]
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for row, txt in enumerate(lower):
+        for word in set(_TOKEN_RE.findall(txt)):
+            postings[word].append(row)
+    lengths = np.fromiter((len(t) + 1 for t in lower), dtype=np.int64, count=len(lower))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if ids else np.zeros(0, dtype=np.int64)
+    words = list(postings)
+    word_lengths = np.fromiter((len(w) + 1 for w in words), dtype=np.int64, count=len(words))
+    return VerseTable(
+        ids=np.array(ids, dtype=str),
+        text=_object_array(text),
+        metadata=_object_array([by_id[i][1] for i in ids]),
+        id_to_idx={osis_id: row for row, osis_id in enumerate(ids)},
+        vocab="\x00".join(words),
+        vocab_offsets=np.concatenate(([0], np.cumsum(word_lengths)[:-1])) if words else np.zeros(0, dtype=np.int64),
+        postings=[np.array(postings[w], dtype=np.int32) for w in words],
+        # NUL separators keep a match from spanning two verses
+        corpus="\x00".join(lower),
+        offsets=offsets,
+        ends=np.append(offsets[1:] - 1, lengths.sum() - 1) if ids else offsets,
+    )
+
+
 class DatabaseManager:
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(self, db_path: Path = DB_PATH, eager: bool = False):
         self.db_path = db_path
         self.client: Optional[Any] = None
-        self.router = RetrievalRouter()
-        self.kjv_by_osis: Dict[str, Dict] = {}
-        self.web_by_osis: Dict[str, Dict] = {}
+        self.router = _get_router()
+        # Verse caches per translation ("KJV", "WEB"), stored column-wise
+        self.verses: Dict[str, VerseTable] = {}
         self.strongs_by_num: Dict[str, Dict] = {}
-        self.word_to_strongs: Dict[str, List[str]] = {}
+        # Display fields for get_strongs_entries, parsed once at load
+        self._strongs_parsed: Dict[str, Dict[str, Any]] = {}
+        self.word_to_strongs: Dict[str, Tuple[str, ...]] = {}
         self.word_summary_docs: Dict[str, str] = {}
-        self.embedding_model: Optional[Any] = None
-        self.reranker: Optional[Any] = None  # Cross-encoder for reranking
-        self.device: str = "cpu"
-        # Try to prepare an embedding model, but don't crash if unavailable
+        # embedding_model, device and torch_hip load on first use (see the properties below)
+        # Weight dtype of the GPU model (bf16, or fp16 without bf16 support); None on CPU
+        self._half_dtype: Optional[Any] = None
+        self._emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._rerank_cache: "OrderedDict[tuple, float]" = OrderedDict()
+        # (collection, query, k) -> (stored_at, results)
+        self._query_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Collection handles by name, reused across queries
+        self._cols: Dict[str, Any] = {}
+        # FAISS exports of static collections (None = not exported, use Chroma)
+        self._faiss: Dict[str, Optional[tuple]] = {}
+        # Collection sizes for n_results caps; refresh_stats() drops them
+        self._col_counts: Dict[str, int] = {}
+        # Cached collection counts for stats() and when they were taken
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_ts: float = 0.0
+        self._pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="tinyowl-query")
+        if os.environ.get("TINYOWL_STATS_REFRESH") == "1":
+            self._schedule_stats_refresh()
+        if eager:
+            # Servers: pay model load and collection lookups at boot, not on the first query
+            self.embedding_model
+            self.warm()
+
+    @cached_property
+    def device(self) -> str:
+        try:
+            import torch  # type: ignore
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        except Exception:
+            return "cpu"
+
+    @cached_property
+    def torch_hip(self) -> Optional[str]:
+        # ROCm shows up under torch.cuda on ROCm builds; capture HIP version if present
+        try:
+            import torch  # type: ignore
+            return getattr(torch.version, "hip", None)
+        except Exception:
+            return None
+
+    @cached_property
+    def reranker(self) -> Optional[Any]:
+        """Cross-encoder for reranking, loaded once on first use."""
+        return _load_reranker(self.device)
+
+    @cached_property
+    def embedding_model(self) -> Optional[Any]:
+        """Query encoder, loaded on first access; None if unavailable."""
         try:
             # Avoid accidental network calls in restricted environments
             os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
             os.environ.setdefault("HF_HUB_OFFLINE", "1")
-            from sentence_transformers import SentenceTransformer  # type: ignore
-            # Select device automatically
-            try:
-                import torch  # type: ignore
-                self.device = "cuda" if torch.cuda.is_available() else "cpu"
-                # ROCm shows up under torch.cuda on ROCm builds; capture HIP version if present
-                self.torch_hip = getattr(torch.version, "hip", None)
-            except Exception:
-                self.device = "cpu"
-                self.torch_hip = None
-            # Use the same embedding model as ingestion (BGE-large, 1024-dim)
-            self.embedding_model = SentenceTransformer("BAAI/bge-large-en-v1.5", device=self.device)
+            # Use the same embedding model as ingestion; int8 ONNX when on CPU
+            model = _load_int8_embedding_model() if self.device == "cpu" else None
+            return model if model is not None else self._load_torch_model()
         except Exception:
             # Will fall back to query_texts if Chroma supports it, else no vector search
-            self.embedding_model = None
-            self.torch_hip = None
+            return None
+
+    def _load_torch_model(self) -> Any:
+        """BGE-large on torch: native bf16/fp16 weights on GPU, fp32 with bounded threads on CPU."""
+        from sentence_transformers import SentenceTransformer  # type: ignore
+        try:
+            import torch  # type: ignore
+            if self.device == "cuda":
+                # bf16 where supported (Ampere+, ROCm), else fp16
+                half = torch.bfloat16 if (self.torch_hip or torch.cuda.is_bf16_supported()) else torch.float16
+                model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=self.device, model_kwargs={"torch_dtype": half})
+                self._half_dtype = half
+                torch.backends.cuda.matmul.allow_tf32 = True
+                return model
+            torch.set_num_threads(CPU_THREADS)
+            try:
+                # Concurrent encode() callers already run in parallel; nested
+                # inter-op pools would oversubscribe the cores
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # already set, or parallel work has started
+        except Exception:
+            self._half_dtype = None
+        return SentenceTransformer(EMBEDDING_MODEL_NAME, device=self.device)
 
     def connect(self) -> None:
         if self.client is not None:
@@ -76,79 +608,229 @@ class DatabaseManager:
         try:
             import chromadb  # type: ignore
             self.client = chromadb.PersistentClient(path=str(self.db_path))
+            self._query_cache.clear()
+            self._cols.clear()
+            self._stats_cache = None
+            self._col_counts.clear()
         except Exception:
             self.client = None
 
-    def load_fast_lookup(self) -> None:
-        # KJV
-        if KJV_VERSES_JSON.exists():
-            with KJV_VERSES_JSON.open() as f:
-                data = json.load(f)
-                for c in data.get("chunks", []):
-                    self.kjv_by_osis[c["osis_id"]] = c
-        # WEB
-        if WEB_VERSES_JSON.exists():
-            with WEB_VERSES_JSON.open() as f:
-                data = json.load(f)
-                for c in data.get("chunks", []):
-                    self.web_by_osis[c["osis_id"]] = c
-        # Strong's numbers
-        if STRONGS_NUMBERS_JSON.exists():
-            with STRONGS_NUMBERS_JSON.open() as f:
-                for item in json.load(f):
-                    sn = item.get("metadata", {}).get("strong_number")
-                    if sn:
-                        self.strongs_by_num[sn.upper()] = item
-        # Strong's word summaries (map English words to top Strong's numbers)
-        if STRONGS_WORD_SUMMARIES_JSON.exists():
+    def _collection(self, name: str) -> Any:
+        """Cached get_collection(); raises like Chroma if the collection is missing."""
+        col = self._cols.get(name)
+        if col is None:
+            col = self.client.get_collection(name=name)  # type: ignore
+            self._cols[name] = col
+        return col
+
+    def _count(self, name: str) -> int:
+        """Cached col.count(); collections are not written to while the app runs."""
+        n = self._col_counts.get(name)
+        if n is None:
+            n = self._collection(name).count()
+            self._col_counts[name] = n
+        return n
+
+    def warm(self) -> None:
+        """Connect and preload the known collection handles ahead of the first query."""
+        self.connect()
+        if self.client is None:
+            return
+        for name in COLLECTION_NAMES:
             try:
-                with STRONGS_WORD_SUMMARIES_JSON.open() as f:
-                    for item in json.load(f):
-                        content = (item.get("content") or "").strip()
-                        # Expect patterns like: "Word 'FAITH' — ... Top Strong's: Hxxxx, Gxxxx"
-                        mword = re.search(r"Word\s+'([^']+)'", content)
-                        mtop = re.search(r"Top Strong's:\s*([HG]\d+(?:\s*,\s*[HG]?\d+)*)", content)
-                        if mword and mtop:
-                            w = mword.group(1).strip().upper()
-                            nums = [n.strip() if n[0] in ('H','G') else ('H'+n.strip()) for n in mtop.group(1).split(',')]
-                            # Normalize to include H/G prefix
-                            norm = []
-                            for n in nums:
-                                n = n.strip().upper()
-                                if not n:
-                                    continue
-                                if n[0] not in ('H','G'):
-                                    n = 'H' + n
-                                norm.append(n)
-                            if norm:
-                                self.word_to_strongs[w] = norm
-                            if content:
-                                self.word_summary_docs[w] = content
+                self._collection(name)
             except Exception:
-                # Non-fatal
-                pass
+                continue
+
+    def prefetch(self) -> None:
+        """Start cold-cache readahead of the Chroma store and the pickled lookup maps."""
+        _prefetch(self.db_path / "chroma.sqlite3")
+        for src in (KJV_VERSES_JSON, WEB_VERSES_JSON, STRONGS_NUMBERS_JSON, STRONGS_WORD_SUMMARIES_JSON):
+            _prefetch(_cache_path(src))
 
-    # Retrieval function used by router
+    def load_fast_lookup(self) -> None:
+        """Load verse and Strong's caches; the four files are parsed concurrently."""
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="tinyowl-load") as ex:
+            # Every file's parsed form is pickled next to its JSON after the first parse
+            verse_jobs = {
+                source: ex.submit(_cached_load, path, _verse_table)
+                for source, path in (("KJV", KJV_VERSES_JSON), ("WEB", WEB_VERSES_JSON))
+                if path.exists()
+            }
+            strongs_job = (
+                ex.submit(_cached_load, STRONGS_NUMBERS_JSON, _strongs_tables)
+                if STRONGS_NUMBERS_JSON.exists()
+                else None
+            )
+            # Strong's word summaries (map English words to top Strong's numbers)
+            words_job = (
+                ex.submit(_cached_load, STRONGS_WORD_SUMMARIES_JSON, _word_summary_maps)
+                if STRONGS_WORD_SUMMARIES_JSON.exists()
+                else None
+            )
+        # Results are published from this thread only
+        for source, job in verse_jobs.items():
+            self.verses[source] = job.result()
+        if strongs_job is not None:
+            self.strongs_by_num, self._strongs_parsed = strongs_job.result()
+        if words_job is not None:
+            word_to_strongs, word_summary_docs = words_job.result()
+            self.word_to_strongs.update(word_to_strongs)
+            self.word_summary_docs.update(word_summary_docs)
+
+    @staticmethod
+    def _corpus_search(table: VerseTable, t_low: str) -> np.ndarray:
+        """One pass over the table's buffer; returns matching row indices.
+
+        Uses a Hyperscan block-mode database when installed, else the re engine.
+        """
+        if hyperscan is not None:
+            needle = t_low.encode()
+            data, offsets = table.utf8_corpus()
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(expressions=[re.escape(t_low).encode()], ids=[0], elements=1, flags=[0])
+            ends: List[int] = []
+            db.scan(data, match_event_handler=lambda _id, _from, to, _flags, _ctx: ends.append(to))
+            starts = np.asarray(ends, dtype=np.int64) - len(needle)
+        else:
+            offsets = table.offsets
+            starts = np.fromiter((m.start() for m in re.finditer(re.escape(t_low), table.corpus)), dtype=np.int64)
+        return np.unique(np.searchsorted(offsets, starts, side="right") - 1)
+
+    @staticmethod
+    def _lexical_candidates(table: VerseTable, t_low: str) -> np.ndarray:
+        """Verses that can contain t_low, from the postings of its longest token.
+
+        Any verse containing t_low has a word containing each of its tokens,
+        so the union over matching vocabulary words is a superset of the hits.
+        Queries without word characters fall back to a scan of the whole corpus
+        buffer.
+        """
+        tokens = _TOKEN_RE.findall(t_low)
+        if not tokens:
+            return DatabaseManager._corpus_search(table, t_low)
+        tok = max(tokens, key=len)
+        # Vocabulary words containing tok: one scan of the vocab buffer instead of
+        # a Python-level test per word. Tokens hold no NUL, so no match spans two words
+        starts = np.fromiter((m.start() for m in re.finditer(re.escape(tok), table.vocab)), dtype=np.int64)
+        if not starts.size:
+            return np.zeros(0, dtype=np.int32)
+        words = np.unique(np.searchsorted(table.vocab_offsets, starts, side="right") - 1)
+        postings = table.postings
+        return np.unique(np.concatenate([postings[w] for w in words.tolist()]))
+
+    def encode_many(self, queries: List[str]) -> List[np.ndarray]:
+        """Embed queries, reusing cached vectors and batching the misses.
+
+        Misses are encoded together, sorted by length so each batch pads to
+        similar sizes, and added to the LRU cache. Keys are stripped and
+        lowercased: BGE's tokenizer is uncased, so the vectors are identical.
+        """
+        keys = [q.strip().lower() for q in queries]
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        for q in dict.fromkeys(keys):
+            vec = self._emb_cache.get(q)
+            if vec is None:
+                missing.append(q)
+            else:
+                self._emb_cache.move_to_end(q)
+                found[q] = vec
+        if missing:
+            missing.sort(key=len)
+            vecs = self._encode(missing)
+            for q, vec in zip(missing, vecs):
+                vec.setflags(write=False)  # shared via the cache
+                found[q] = vec
+                self._emb_cache[q] = vec
+            while len(self._emb_cache) > EMBED_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+        return [found[q] for q in keys]
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        model = self.embedding_model  # loads on first use, setting _half_dtype on GPU
+        # A lone query is one batch of one, never padded against anything
+        kwargs = dict(batch_size=min(ENCODE_BATCH_SIZE, len(texts)), convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        if self._half_dtype is None:
+            return model.encode(texts, **kwargs)
+        import torch  # type: ignore
+        # Weights are already half precision; upcast pooled outputs before normalizing
+        kwargs.update(convert_to_numpy=False, convert_to_tensor=True, normalize_embeddings=False)
+        with torch.inference_mode():
+            vecs = torch.nn.functional.normalize(model.encode(texts, **kwargs).float(), dim=-1)
+        return vecs.cpu().numpy()
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        return self.encode_many([query])[0]
+
+    # Retrieval functions used by router
     def _retrieve_from_collection(self, collection_name: str, query: str, k: int) -> List[Dict[str, Any]]:
+        return self._retrieve_from_collections([collection_name], query, k)[collection_name]
+
+    def _retrieve_from_collections(self, names: List[str], query: str, k: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Search several collections for one query.
+
+        The query is embedded once; collections not in the result cache are
+        queried concurrently on the worker pool.
+        """
         if not self.client:
             self.connect()
         if self.client is None:
-            return []
-        try:
-            col = self.client.get_collection(name=collection_name)  # type: ignore
-        except Exception:
-            return []
-        res: Dict[str, Any] = {"documents": [[]], "metadatas": [[]], "ids": [[]], "distances": [[]]}
+            return {name: [] for name in names}
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        now = time.monotonic()
+        for name in dict.fromkeys(names):
+            key = (name, query, k)
+            hit = self._query_cache.get(key)
+            if hit is not None and now - hit[0] < RESULT_CACHE_TTL:
+                self._query_cache.move_to_end(key)
+                found[name] = hit[1]
+            else:
+                missing.append(name)
+        if missing:
+            try:
+                # (1, dim) float32 view of the cached vector; Chroma and FAISS take arrays directly
+                emb = self._embed_query(query).astype(np.float32, copy=False)[None, :] if self.embedding_model is not None else None
+            except Exception:
+                return {name: [dict(r) for r in found.get(name, [])] for name in names}
+            if len(missing) == 1:
+                fetched = [self._query_collection(missing[0], query, emb, k)]
+            else:
+                fetched = list(self._pool.map(lambda name: self._query_collection(name, query, emb, k), missing))
+            for name, rows in zip(missing, fetched):
+                if rows is None:
+                    continue
+                found[name] = rows
+                self._query_cache[(name, query, k)] = (time.monotonic(), rows)
+                self._query_cache.move_to_end((name, query, k))
+            while len(self._query_cache) > RESULT_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return {name: [dict(r) for r in found.get(name, [])] for name in names}
+
+    def _query_collection(self, collection_name: str, query: str, emb: Optional[np.ndarray], k: int) -> Optional[List[Dict[str, Any]]]:
+        """One collection query (runs on the worker pool); None if it fails.
+
+        Collections exported to FAISS are searched there; the rest go to Chroma.
+        """
         try:
-            if self.embedding_model is not None:
-                # Keep batch_size small for interactivity
-                emb = self.embedding_model.encode(query, batch_size=8).tolist()
-                res = col.query(query_embeddings=[emb], n_results=k, include=["documents", "metadatas", "distances"])  # type: ignore
+            if emb is not None and collection_name not in self._faiss:
+                self._faiss[collection_name] = _load_faiss_collection(self.db_path, collection_name)
+            exported = self._faiss.get(collection_name) if emb is not None else None
+            if exported is not None:
+                res = _faiss_query(*exported, emb, k)
+                space = exported[1].get("space", "l2")
             else:
-                # Fallback to provider-side text embedding if available
-                res = col.query(query_texts=[query], n_results=k, include=["documents", "metadatas", "distances"])  # type: ignore
+                col = self._collection(collection_name)
+                space = (col.metadata or {}).get("hnsw:space", "l2")
+                if emb is not None:
+                    res = col.query(query_embeddings=emb, n_results=k, include=["documents", "metadatas", "distances"])  # type: ignore
+                else:
+                    # Fallback to provider-side text embedding if available
+                    res = col.query(query_texts=[query], n_results=k, include=["documents", "metadatas", "distances"])  # type: ignore
         except Exception:
-            return []
+            return None
+        to_score = _SCORE_FROM_DISTANCE.get(space, _SCORE_FROM_DISTANCE["l2"])
         out: List[Dict[str, Any]] = []
         docs = res.get("documents", [[]])[0]
         metas = res.get("metadatas", [[]])[0]
@@ -159,31 +841,37 @@ class DatabaseManager:
             out.append({
                 "id": ids[i] if i < len(ids) else "",
                 "content": docs[i],
-                "score": 1.0 - (dists[i] if i < len(dists) else 0.0),
+                "score": to_score(dists[i] if i < len(dists) else 0.0),
                 "metadata": meta,
             })
         return out
 
     def device_info(self) -> Dict[str, Any]:
         info: Dict[str, Any] = {
-            "embedding_device": getattr(self, "device", "cpu"),
-            "embedding_model_loaded": self.embedding_model is not None,
+            "embedding_device": self.device,
+            # Report without forcing the lazy model load
+            "embedding_model_loaded": self.__dict__.get("embedding_model") is not None,
         }
-        try:
-            import torch  # type: ignore
-            info.update({
-                "torch_cuda_available": bool(torch.cuda.is_available()),
-                "torch_device_name": torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
-                "torch_hip_version": getattr(torch.version, "hip", None),
-            })
-        except Exception:
-            info.update({
-                "torch_cuda_available": False,
-                "torch_device_name": None,
-                "torch_hip_version": None,
-            })
+        info.update(self._torch_info)
         return info
 
+    @cached_property
+    def _torch_info(self) -> Dict[str, Any]:
+        """Accelerator details for device_info; the driver is asked once per process."""
+        cuda = self.device == "cuda"
+        name = None
+        if cuda:
+            try:
+                import torch  # type: ignore
+                name = torch.cuda.get_device_name(0)
+            except Exception:
+                pass
+        return {
+            "torch_cuda_available": cuda,
+            "torch_device_name": name,
+            "torch_hip_version": self.torch_hip,
+        }
+
     def routed_search(self, query: str, use_reranking: bool = True) -> List[Dict[str, Any]]:
         """
         Execute routed search with query enhancement, hybrid search, and reranking
@@ -200,7 +888,8 @@ class DatabaseManager:
             query,
             self._retrieve_from_collection,
             hybrid_search_function=self.hybrid_search,
-            rerank_function=self.rerank_with_cross_encoder if use_reranking else None
+            rerank_function=self.rerank_with_cross_encoder if use_reranking else None,
+            batch_retrieval_function=self._retrieve_from_collections,
         )
 
         out = []
@@ -217,41 +906,59 @@ class DatabaseManager:
 
     def verse_lookup(self, osis_id: str) -> List[ConcordanceResult]:
         res: List[ConcordanceResult] = []
-        if osis_id in self.kjv_by_osis:
-            item = self.kjv_by_osis[osis_id]
-            res.append(ConcordanceResult(source="KJV", osis_id=osis_id, text=item["content"], metadata=item.get("metadata", {})))
-        if osis_id in self.web_by_osis:
-            item = self.web_by_osis[osis_id]
-            res.append(ConcordanceResult(source="WEB", osis_id=osis_id, text=item["content"], metadata=item.get("metadata", {})))
+        for source, table in self.verses.items():
+            row = table.id_to_idx.get(osis_id)
+            if row is not None:
+                res.append(ConcordanceResult(source=source, osis_id=osis_id, text=table.text[row], metadata=table.metadata[row]))
         return res
 
     def strongs_lookup(self, number: str) -> Optional[Dict[str, Any]]:
+        # Keys are stored uppercased; canonical "H123"/"G123" input hits directly
+        entry = self.strongs_by_num.get(number)
+        if entry is not None:
+            return entry
         num = number.strip().upper()
         if num.startswith("H") or num.startswith("G"):
             return self.strongs_by_num.get(num)
         return self.strongs_by_num.get(f"H{num}") or self.strongs_by_num.get(f"G{num}")
 
-    def stats(self) -> Dict[str, Any]:
-        stats = {}
+    def _schedule_stats_refresh(self) -> None:
+        def refresh() -> None:
+            self._refresh_collection_counts()
+            self._schedule_stats_refresh()
+        timer = threading.Timer(STATS_TTL, refresh)
+        timer.daemon = True
+        timer.start()
+
+    def _refresh_collection_counts(self) -> Dict[str, Any]:
+        counts: Dict[str, Any] = {}
         try:
             if not self.client:
                 self.connect()
             assert self.client is not None
-            for name in [
-                "kjv_verses", "kjv_pericopes", "kjv_chapters",
-                "web_verses", "web_pericopes", "web_chapters",
-                "strongs_concordance_entries",
-                "sop_paragraphs", "sop_chapters",
-            ]:
+            for name in COLLECTION_NAMES:
                 try:
-                    col = self.client.get_collection(name)
-                    stats[name] = col.count()
+                    counts[name] = self._col_counts[name] = self._collection(name).count()
                 except Exception:
                     continue
         except Exception:
             pass
-        stats["kjv_cached_verses"] = len(self.kjv_by_osis)
-        stats["web_cached_verses"] = len(self.web_by_osis)
+        self._stats_cache, self._stats_ts = counts, time.monotonic()
+        return counts
+
+    def refresh_stats(self) -> Dict[str, Any]:
+        """Drop cached collection counts and recount."""
+        self._col_counts.clear()
+        self._stats_cache = None
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self._stats_cache
+        if counts is None or time.monotonic() - self._stats_ts >= STATS_TTL:
+            counts = self._refresh_collection_counts()
+        stats = dict(counts)
+        stats["kjv_cached_verses"] = len(self.verses.get("KJV", ()))
+        stats["web_cached_verses"] = len(self.verses.get("WEB", ()))
         stats["strongs_cached_numbers"] = len(self.strongs_by_num)
         stats["word_to_strongs"] = len(self.word_to_strongs)
         return stats
@@ -264,28 +971,21 @@ class DatabaseManager:
         t = term.strip()
         if not t:
             return []
-        t_low = t.lower()
+        t_low = t.casefold()
         results: List[Dict[str, Any]] = []
 
-        # Search KJV
-        for osis_id, item in self.kjv_by_osis.items():
-            txt = item.get("content", "")
-            if t_low in txt.lower():
-                results.append({
-                    "osis_id": osis_id,
-                    "source": "KJV",
-                    "text": txt,
-                })
-
-        # Search WEB
-        for osis_id, item in self.web_by_osis.items():
-            txt = item.get("content", "")
-            if t_low in txt.lower():
-                results.append({
-                    "osis_id": osis_id,
-                    "source": "WEB",
-                    "text": txt,
-                })
+        # Search KJV then WEB: postings narrow the candidates, substring check confirms
+        for source, table in self.verses.items():
+            corpus = table.corpus
+            rows = self._lexical_candidates(table, t_low)
+            # Plain ints index the object arrays without boxing a NumPy scalar per row
+            for row, start, end in zip(rows.tolist(), table.offsets[rows].tolist(), table.ends[rows].tolist()):
+                if corpus.find(t_low, start, end) != -1:
+                    results.append({
+                        "osis_id": str(table.ids[row]),
+                        "source": source,
+                        "text": table.text[row],
+                    })
 
         # Sort by OSIS id then source for stable pagination
         results.sort(key=lambda r: (r["osis_id"], r["source"]))
@@ -295,57 +995,11 @@ class DatabaseManager:
         t = (term or "").strip().upper()
         if not t:
             return []
-        return self.word_to_strongs.get(t, [])
+        return list(self.word_to_strongs.get(t, ()))
 
     def get_strongs_entries(self, numbers: List[str]) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        for n in numbers:
-            key = n.upper()
-            entry = self.strongs_by_num.get(key)
-            if not entry:
-                continue
-            content = (entry.get("content") or "").strip()
-            # Prefer definition block before '---'
-            def_block = content.split("---", 1)[0].strip()
-
-            # Attempt to parse lemma + transliteration line (e.g., "1813 exaleipho ex-al-i'-fo")
-            lemma = ""
-            translit = ""
-            import re
-            lines = [ln.strip() for ln in def_block.splitlines() if ln.strip()]
-            # Find a line that starts with a number then words
-            for ln in lines:
-                m = re.match(r"^(\d+)\s+([A-Za-z][A-Za-z\-']*)\s+(.+)$", ln)
-                if m:
-                    lemma = m.group(2)
-                    translit = m.group(3).strip()
-                    break
-
-            language = "Hebrew" if key.startswith('H') else ("Greek" if key.startswith('G') else "")
-
-            # Build a concise definition snippet (first 1-3 lines after lemma line)
-            snippet_lines: List[str] = []
-            started = False
-            for ln in lines:
-                if not started:
-                    # Skip until after lemma line
-                    if lemma and lemma in ln:
-                        started = True
-                    continue
-                # Stop at next header-style line or if we have enough
-                if len(snippet_lines) >= 3:
-                    break
-                snippet_lines.append(ln)
-            snippet = " ".join(snippet_lines).strip() or def_block
-
-            out.append({
-                "number": key,
-                "language": language,
-                "lemma": lemma,
-                "transliteration": translit,
-                "definition": snippet,
-            })
-        return out
+        parsed = self._strongs_parsed
+        return [parsed[key] for key in (n.upper() for n in numbers) if key in parsed]
 
     def semantic_word_search(self, word: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Find semantically similar words using vector embeddings.
@@ -354,16 +1008,12 @@ class DatabaseManager:
         """
         if not self.client:
             self.connect()
-        if self.client is None:
+        if self.client is None or self.embedding_model is None:
             return []
 
         try:
-            # Ensure we have the embedding model loaded
-            if not self.embedding_model:
-                from sentence_transformers import SentenceTransformer  # type: ignore
-                self.embedding_model = SentenceTransformer("BAAI/bge-large-en-v1.5", device=self.device)
-
-            query_embedding = self.embedding_model.encode([word], show_progress_bar=False)[0]
+            # Shares the query-embedding LRU with the router path
+            query_embedding = np.ascontiguousarray(self._embed_query(word), dtype=np.float32)[None, :]
 
             # Prefer definitional summaries; fall back to concordance if unavailable
             collections_to_try = [
@@ -371,61 +1021,46 @@ class DatabaseManager:
                 "strongs_concordance_entries",
             ]
 
-            stop_words = {"the", "and", "of", "to", "in", "a", "is", "that", "it", "for",
-                          "be", "with", "as", "by", "on", "not", "he", "this", "from",
-                          "but", "they", "have", "was", "his", "which", "their", "said",
-                          "if", "will", "all", "were", "when", "there", "been", "has",
-                          "or", "an", "had", "are", "you", "her", "them", "him", "me",
-                          "my", "i", "she", "your", "we", "so", "at", "one", "into"}
-
-            word_scores: Dict[str, float] = {}
+            # The query word itself is dropped along with the stop words
+            rejected = _STOP_WORDS | {word.lower()}
+            kept_words: List[np.ndarray] = []
+            kept_sims: List[np.ndarray] = []
 
             for collection_name in collections_to_try:
                 try:
-                    col = self.client.get_collection(name=collection_name)
+                    col = self._collection(collection_name)
                 except Exception:
                     continue
 
                 try:
                     results = col.query(
-                        query_embeddings=[query_embedding.tolist()],
-                        n_results=min(200, col.count()),
+                        query_embeddings=query_embedding,
+                        n_results=min(200, self._count(collection_name)),
                         include=["documents", "distances", "metadatas"],
                     )
                 except Exception:
                     continue
 
-                found_any = False
-                for doc_list, dist_list, meta_list in zip(
-                    results.get("documents", [[]]),
-                    results.get("distances", [[]]),
-                    results.get("metadatas", [[]])
-                ):
-                    for doc, dist, meta in zip(doc_list, dist_list, meta_list):
-                        candidate_word = meta.get("word", "").lower().strip()
-
-                        if not candidate_word or candidate_word == word.lower():
-                            continue
-
-                        if candidate_word in stop_words or len(candidate_word) < 3:
-                            continue
-
-                        similarity = 1 / (1 + dist)
-
-                        if candidate_word not in word_scores or similarity > word_scores[candidate_word]:
-                            word_scores[candidate_word] = similarity
-                            found_any = True
+                words, sims = _word_similarities(results)
+                # One frozenset probe per candidate; np.isin on object arrays sorts
+                # with Python comparisons and measured ~10x slower at this size
+                keep = np.fromiter(
+                    (len(w) >= 3 and w not in rejected for w in words.tolist()),
+                    dtype=bool,
+                    count=len(words),
+                )
+                found_any = bool(keep.any())
+                kept_words.append(words[keep])
+                kept_sims.append(sims[keep])
 
                 if found_any and collection_name == "strongs_word_summaries":
                     # Prefer definitional summaries; stop once we have matches from this layer
                     break
 
-            sorted_words = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
-
-            return [
-                {"word": w, "similarity": round(score, 3)}
-                for w, score in sorted_words[:limit]
-            ]
+            if not kept_words:
+                return []
+            top = _top_words(np.concatenate(kept_words), np.concatenate(kept_sims), limit)
+            return [{"word": w, "similarity": round(score, 3)} for w, score in top]
 
         except Exception:
             return []
@@ -480,39 +1115,40 @@ class DatabaseManager:
         Returns:
             Merged and reranked results
         """
-        fused_scores: Dict[str, float] = {}
-        all_results: Dict[str, Dict[str, Any]] = {}
-
-        # Weight semantic results
-        for rank, result in enumerate(semantic_results):
-            result_id = result.get("id", "")
-            if not result_id:
-                continue
-
-            all_results[result_id] = result
-            rrf_score = 0.6 * (1.0 / (k + rank + 1))  # 60% weight to semantic
-            fused_scores[result_id] = fused_scores.get(result_id, 0) + rrf_score
-
-        # Weight keyword results (higher for exact matches)
-        for rank, result in enumerate(keyword_results):
-            result_id = result.get("id", "")
-            if not result_id:
-                continue
-
-            if result_id not in all_results:
-                all_results[result_id] = result
-
-            rrf_score = 0.4 * (1.0 / (k + rank + 1))  # 40% weight to keyword
-            fused_scores[result_id] = fused_scores.get(result_id, 0) + rrf_score
+        entries = list(semantic_results) + list(keyword_results)
+        if not entries:
+            return []
+        # Rank weights: 60% to semantic, 40% to keyword (higher for exact matches)
+        weights = np.concatenate([
+            0.6 / (k + np.arange(len(semantic_results)) + 1.0),
+            0.4 / (k + np.arange(len(keyword_results)) + 1.0),
+        ])
+        ids = [r.get("id", "") for r in entries]
+        rows = np.flatnonzero(np.fromiter((bool(i) for i in ids), dtype=bool, count=len(ids)))
+        if not rows.size:
+            return []
 
-        # Sort by fused score
-        sorted_ids = sorted(fused_scores.keys(), key=lambda x: fused_scores[x], reverse=True)
+        # Sum weights per distinct id
+        uniq, first, inverse = np.unique(
+            np.array([ids[r] for r in rows], dtype=object), return_index=True, return_inverse=True
+        )
+        fused = np.zeros(len(uniq))
+        np.add.at(fused, inverse, weights[rows])
+        # Result dict per id: its last semantic occurrence, else its first keyword one
+        source = rows[first]
+        is_semantic = rows < len(semantic_results)
+        last_semantic = np.full(len(uniq), -1)
+        np.maximum.at(last_semantic, inverse[is_semantic], rows[is_semantic])
+        source = np.where(last_semantic >= 0, last_semantic, source)
+
+        top = np.argpartition(-fused, top_k)[:top_k] if top_k < len(fused) else np.arange(len(fused))
+        # Highest fused score first; ties keep first-seen order
+        top = top[np.lexsort((first[top], -fused[top]))]
 
-        # Build final results
         merged = []
-        for result_id in sorted_ids[:top_k]:
-            result = all_results[result_id]
-            result["score"] = fused_scores[result_id]
+        for u in top:
+            result = entries[source[u]]
+            result["score"] = float(fused[u])
             merged.append(result)
 
         return merged
@@ -535,25 +1171,26 @@ class DatabaseManager:
         if not results:
             return []
 
-        # Lazy load cross-encoder
+        # Fall back to original results if cross-encoder unavailable
         if self.reranker is None:
-            try:
-                from sentence_transformers import CrossEncoder  # type: ignore
-                # Use lightweight cross-encoder (40MB model)
-                self.reranker = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
-            except Exception:
-                # Fall back to original results if cross-encoder unavailable
-                return results[:top_k]
+            return results[:top_k]
 
         try:
-            # Prepare query-document pairs for reranking
-            pairs = []
-            for r in results[:20]:  # Only rerank top 20 to save time
-                content = r.get("content", "")[:512]  # Limit length for speed
-                pairs.append([query, content])
-
-            # Get cross-encoder scores
-            scores = self.reranker.predict(pairs)
+            # Prepare query-document pairs for reranking (top 20 only, passages capped)
+            keys = [(query, r.get("content", "")[:RERANK_MAX_CHARS]) for r in results[:20]]
+            cache = self._rerank_cache
+            missing = [key for key in dict.fromkeys(keys) if key not in cache]
+            if missing:
+                # All uncached pairs in one batch: a single tokenizer call (padded to the
+                # longest pair, truncated at RERANK_MAX_TOKENS) and one forward pass
+                fresh = self.reranker.predict([list(key) for key in missing], batch_size=len(missing), show_progress_bar=False)
+                for key, score in zip(missing, fresh):
+                    cache[key] = float(score)
+            for key in keys:
+                cache.move_to_end(key)
+            scores = [cache[key] for key in keys]
+            while len(cache) > RERANK_CACHE_SIZE:
+                cache.popitem(last=False)
 
             # Update scores
             for i, r in enumerate(results[:20]):
@@ -573,17 +1210,10 @@ class DatabaseManager:
         """Compute a concept vector from +/- words and return nearest definitional neighbours."""
         if not self.client:
             self.connect()
-        if self.client is None:
+        if self.client is None or self.embedding_model is None:
             return {"results": [], "positives": [], "negatives": []}
 
-        if not self.embedding_model:
-            try:
-                from sentence_transformers import SentenceTransformer  # type: ignore
-                self.embedding_model = SentenceTransformer("BAAI/bge-large-en-v1.5", device=self.device)
-            except Exception:
-                return {"results": [], "positives": [], "negatives": []}
-
-        tokens = re.findall(r'([+-]?)\s*([^,]+)', expression.replace(',', ' '))
+        tokens = _CONCEPT_TERM_RE.findall(expression.replace(',', ' '))
 
         positives: List[str] = []
         negatives: List[str] = []
@@ -600,7 +1230,7 @@ class DatabaseManager:
                     positives.append(normalized)
                 return
 
-            inner_parts = re.split(r'([+-])', token)
+            inner_parts = _SIGN_SPLIT_RE.split(token)
             if len(inner_parts) > 1:
                 current_sign = sign_char if sign_char in ('+', '-') else '+'
                 buffer = ''
@@ -616,7 +1246,7 @@ class DatabaseManager:
                     add_token(current_sign, buffer)
                 return
 
-            filtered = re.sub(r"[^A-Za-z0-9'\-]+", '', token)
+            filtered = _CLEAN_RE.sub('', token)
             if not filtered:
                 return
             final = filtered.upper()
@@ -656,72 +1286,42 @@ class DatabaseManager:
         def lookup_text(word: str) -> str:
             return self.word_summary_docs.get(word.upper(), word)
 
-        def encode_words(words: List[str]) -> Optional[np.ndarray]:
-            if not words:
-                return None
-            texts = [lookup_text(w) for w in words]
-            try:
-                vecs = self.embedding_model.encode(texts, show_progress_bar=False)
-                return np.asarray(vecs, dtype=np.float32)
-            except Exception:
-                return None
-
-        pos_vecs = encode_words(positives)
-        neg_vecs = encode_words(negatives)
-
-        if pos_vecs is None and neg_vecs is None:
+        # One encode call for both signs, rows in positives + negatives order
+        try:
+            vecs = np.asarray(self._encode([lookup_text(w) for w in positives + negatives]), dtype=np.float32)
+        except Exception:
             return {"results": [], "positives": positives, "negatives": negatives}
 
-        concept_vec: Optional[np.ndarray] = None
-        if pos_vecs is not None:
-            concept_vec = pos_vecs.mean(axis=0)
-        if neg_vecs is not None:
-            neg_mean = neg_vecs.mean(axis=0)
-            concept_vec = -neg_mean if concept_vec is None else concept_vec - neg_mean
-
-        if concept_vec is None:
-            return {"results": [], "positives": positives, "negatives": negatives}
+        # mean(positives) - mean(negatives) as one weighted sum (a single GEMV),
+        # then back onto the unit sphere the normalised embeddings live on
+        weights = np.concatenate((
+            np.full(len(positives), 1.0 / max(len(positives), 1), dtype=np.float32),
+            np.full(len(negatives), -1.0 / max(len(negatives), 1), dtype=np.float32),
+        ))
+        concept_vec = weights @ vecs
+        concept_vec /= np.linalg.norm(concept_vec) + 1e-8
 
         try:
-            collection = self.client.get_collection(name="strongs_word_summaries")
+            collection = self._collection("strongs_word_summaries")
         except Exception:
             return {"results": [], "positives": positives, "negatives": negatives}
 
         try:
             results = collection.query(
-                query_embeddings=[concept_vec.tolist()],
-                n_results=min(200, collection.count()),
+                query_embeddings=np.ascontiguousarray(concept_vec, dtype=np.float32)[None, :],
+                n_results=min(200, self._count("strongs_word_summaries")),
                 include=["documents", "distances", "metadatas"],
             )
         except Exception:
             return {"results": [], "positives": positives, "negatives": negatives}
 
-        pos_set = {w.lower() for w in positives}
-        neg_set = {w.lower() for w in negatives}
-
-        candidates: Dict[str, Dict[str, Any]] = {}
-
-        for doc_list, dist_list, meta_list in zip(
-            results.get("documents", [[]]),
-            results.get("distances", [[]]),
-            results.get("metadatas", [[]])
-        ):
-            for doc, dist, meta in zip(doc_list, dist_list, meta_list):
-                candidate = meta.get("word", "").lower().strip()
-                if not candidate or candidate in pos_set or candidate in neg_set:
-                    continue
-                similarity = 1 / (1 + dist)
-                existing = candidates.get(candidate)
-                if not existing or similarity > existing["similarity"]:
-                    candidates[candidate] = {
-                        "word": candidate,
-                        "similarity": round(similarity, 3),
-                    }
-
-        sorted_items = sorted(candidates.values(), key=lambda x: x["similarity"], reverse=True)
+        excluded = {w.lower() for w in positives} | {w.lower() for w in negatives}
+        words, sims = _word_similarities(results)
+        keep = np.fromiter((bool(w) and w not in excluded for w in words), dtype=bool, count=len(words))
+        top = _top_words(words[keep], sims[keep], limit)
 
         return {
-            "results": sorted_items[:limit],
+            "results": [{"word": w, "similarity": round(score, 3)} for w, score in top],
             "positives": positives,
             "negatives": negatives,
         }
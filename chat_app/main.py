@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import atexit
 import os
 import json
+import queue
+import threading
 import time
-from typing import Dict, Any, Optional
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Generator, List, Optional
 
 import readline  # Provides history + tab completion
 from rich.console import Console
+from rich.text import Text
 import sys
 try:
     import curses  # for arrow-key interactive selection
 except Exception:  # pragma: no cover
     curses = None  # type: ignore
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional faster /export
+    orjson = None
 
 from .config import APP_DATA_DIR, HISTORY_FILE_PATH, DEFAULT_AI_MODEL, OLLAMA_HOST
 from .settings import load_settings, save_settings
@@ -30,7 +41,7 @@ from .response_formatter import (
     print_concept_similarity,
     print_analogy_results,
 )
-from .command_parser import parse_command
+from .command_parser import build_dispatcher, parse_strongs_ref
 from .chat_history import ChatHistory
 from .ollama_integration import check_ollama, enhance_with_ai, list_models, generate_stream
 from .osis import OsisHelper
@@ -38,28 +49,86 @@ from .osis import OsisHelper
 
 console = Console()
 
+# Ollama reachability is re-probed at most this often (seconds)
+OLLAMA_PROBE_TTL = 5.0
+_ollama_probe: Dict[str, Any] = {"t": float("-inf"), "ok": False}
+
+
+def ollama_available(force: bool = False) -> bool:
+    """check_ollama(), reusing the last probe for OLLAMA_PROBE_TTL seconds unless forced."""
+    now = time.monotonic()
+    if force or now - _ollama_probe["t"] > OLLAMA_PROBE_TTL:
+        _ollama_probe["ok"] = check_ollama()
+        _ollama_probe["t"] = now
+    return _ollama_probe["ok"]
+
+
+# Installed model names are reused this long (seconds); /ai models always refreshes
+MODELS_CACHE_TTL = 30.0
+_models_cache: Dict[str, Any] = {"t": float("-inf"), "models": []}
+
+
+def cached_models(force: bool = False) -> List[str]:
+    """list_models() memoized for MODELS_CACHE_TTL; empty results are not cached."""
+    now = time.monotonic()
+    if force or not _models_cache["models"] or now - _models_cache["t"] > MODELS_CACHE_TTL:
+        _models_cache["models"] = list_models()
+        _models_cache["t"] = now
+    return _models_cache["models"]
+
+
+SLASH_COMMANDS = (
+    "/help", "/history", "/export", "/clear", "/stats",
+    "/mode", "/mode status", "/mode help", "/mode default",
+    "/ai status", "/ai on", "/ai off", "/ai toggle", "/ai models",
+    "/ai model", "/ai help", "/ai default", "/model",
+)
+# Sorted once: the commands sharing a prefix are a contiguous run found by bisect
+_SLASH_SORTED = tuple(sorted(SLASH_COMMANDS))
+
+
+def _slash_completions(prefix: str) -> List[str]:
+    i = bisect_left(_SLASH_SORTED, prefix)
+    out: List[str] = []
+    while i < len(_SLASH_SORTED) and _SLASH_SORTED[i].startswith(prefix):
+        out.append(_SLASH_SORTED[i])
+        i += 1
+    return out
+
+
+# '@word' completions kept per Completer (LRU); re-TABbing a prefix skips suggest()
+SUGGEST_CACHE_SIZE = 256
+
 
 class Completer:
     def __init__(self, typeahead: TypeaheadEngine):
         self.typeahead = typeahead
         self.current_suggestions = []
+        self._suggest_cache: OrderedDict[str, List[str]] = OrderedDict()
+
+    def _word_completions(self, prefix: str) -> List[str]:
+        key = prefix.lower()  # suggest() is case-insensitive
+        cached = self._suggest_cache.get(key)
+        if cached is not None:
+            self._suggest_cache.move_to_end(key)
+            return cached
+        sugs = self.typeahead.suggest(prefix, limit=10)
+        cached = self._suggest_cache[key] = [f"@{s.term}" for s in sugs]
+        if len(self._suggest_cache) > SUGGEST_CACHE_SIZE:
+            self._suggest_cache.popitem(last=False)
+        return cached
 
     def complete(self, text: str, state: int):
-        buffer = readline.get_line_buffer()
-        if buffer.startswith("@"):  # Strong's words
-            prefix = buffer[1:]
-            sugs = self.typeahead.suggest(prefix, limit=10)
-            self.current_suggestions = [f"@{s.term}" for s in sugs]
-        elif buffer.startswith("/"):
-            cmds = [
-                "/help", "/history", "/export", "/clear", "/stats",
-                "/mode", "/mode status", "/mode help", "/mode default",
-                "/ai status", "/ai on", "/ai off", "/ai toggle", "/ai models",
-                "/ai model", "/ai help", "/ai default", "/model",
-            ]
-            self.current_suggestions = [c for c in cmds if c.startswith(buffer)]
-        else:
-            self.current_suggestions = []
+        # readline calls back with state 0, 1, 2, ... for one TAB press;
+        # candidates are computed on state 0 and indexed afterwards
+        if state == 0:
+            buffer = readline.get_line_buffer()
+            if buffer.startswith("@"):  # Strong's words
+                self.current_suggestions = self._word_completions(buffer[1:])
+            elif buffer.startswith("/"):
+                self.current_suggestions = _slash_completions(buffer)
+            else:
+                self.current_suggestions = []
 
         try:
             return self.current_suggestions[state]
@@ -67,50 +136,238 @@ class Completer:
             return None
 
 
+def _append_history(initial_len: int) -> None:
+    try:
+        readline.append_history_file(readline.get_current_history_length() - initial_len, str(HISTORY_FILE_PATH))
+    except OSError:
+        pass
+
+
+def _preload_typeahead(typeahead: TypeaheadEngine) -> None:
+    try:
+        typeahead.load()
+    except Exception:
+        pass  # retried, and reported, on first use
+
+
+def build_ai_context(results: List[Dict[str, Any]], limit: int = 5) -> str:
+    """Numbered '[i] content' blocks for the AI prompt, blank-line separated."""
+    return "\n\n".join(
+        "[" + str(i) + "] " + (r.get("content") or "") for i, r in enumerate(results[:limit], 1)
+    )
+
+
+# Lines kept in the readline history file
+HISTORY_LENGTH = 1000
+# Streamed tokens are buffered for at most this long (seconds) or this many characters
+STREAM_FLUSH_INTERVAL = 0.016
+STREAM_FLUSH_CHARS = 256
+# Fixed banners, parsed from markup once instead of on every print
+_AI_HEADER = Text.from_markup("\n[bold green]AI-enhanced summary (streaming):[/bold green]")
+_AI_INTERRUPTED = Text.from_markup("\n[dim]AI streaming interrupted by user[/dim]")
+_GOODBYE = Text("\nGoodbye!")
+AI_PROMPT_TEMPLATE = (
+    "You are a theological research assistant. Using ONLY the context provided, answer the query and cite sources by [index].\n\n"
+    "Context:\n{ctx}\n\nQuery: {q}\nAnswer:"
+)
+
+
+# Marks the end of a stream handed over by _pump_stream
+_STREAM_END = object()
+
+
+def _pump_stream(it: Generator[str, None, None], chunks: "queue.Queue[Any]", stop: threading.Event) -> None:
+    """Move chunks from it onto the queue, then _STREAM_END; errors are passed along."""
+    try:
+        for chunk in it:
+            if stop.is_set():
+                break
+            chunks.put(chunk)
+    except BaseException as e:
+        chunks.put(e)
+    finally:
+        it.close()
+        chunks.put(_STREAM_END)
+
+
+def stream_ai_answer(q: str, results: List[Dict[str, Any]], ai_model: str, history: ChatHistory, session_id: int) -> None:
+    """Stream an Ollama answer grounded in the top results and record it in history."""
+    prompt = AI_PROMPT_TEMPLATE.format(ctx=build_ai_context(results), q=q)
+    console.print(_AI_HEADER)
+    ai_text = []
+    it = generate_stream(prompt, model=ai_model)
+    first_chunk: Optional[str] = None
+    # Show spinner until first token arrives
+    with console.status(f"AI ({ai_model}) composing…", spinner="dots"):
+        try:
+            first_chunk = next(it)
+        except StopIteration:
+            first_chunk = None
+        except KeyboardInterrupt:
+            console.print(_AI_INTERRUPTED)
+            first_chunk = None
+    # Tokens go straight to the terminal, batched per frame-sized window: Rich
+    # would run its markup parser and render pipeline once per token. The
+    # stream is read on a helper thread so a partial batch is still written
+    # when its window closes, even if the model goes quiet
+    out = console.file
+    pending: List[str] = []
+    pending_chars = 0
+    last_flush = float("-inf")
+
+    def flush_pending() -> None:
+        nonlocal pending_chars, last_flush
+        if pending:
+            out.write("".join(pending))
+            pending.clear()
+            pending_chars = 0
+            out.flush()
+        last_flush = time.monotonic()
+
+    def add(chunk: str) -> None:
+        nonlocal pending_chars
+        ai_text.append(chunk)
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        if pending_chars >= STREAM_FLUSH_CHARS or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+            flush_pending()
+
+    chunks: "queue.Queue[Any]" = queue.Queue()
+    stop = threading.Event()
+    threading.Thread(target=_pump_stream, args=(it, chunks, stop), daemon=True).start()
+    try:
+        if first_chunk:
+            add(first_chunk)
+        while True:
+            # Block until the next token, or only until the pending batch is due
+            timeout = max(0.0, last_flush + STREAM_FLUSH_INTERVAL - time.monotonic()) if pending else None
+            try:
+                item = chunks.get(timeout=timeout)
+            except queue.Empty:
+                flush_pending()
+                continue
+            if item is _STREAM_END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            add(item)
+        flush_pending()
+        console.print("")
+    except KeyboardInterrupt:
+        stop.set()
+        flush_pending()
+        console.print(_AI_INTERRUPTED)
+    full = "".join(ai_text).strip()
+    if full:
+        # A streamed answer proves Ollama is up: the next turn skips its probe
+        _ollama_probe["ok"] = True
+        _ollama_probe["t"] = time.monotonic()
+        history.add_message(session_id, "assistant", full)
+
+
+MODE_LABELS = {
+    "natural": "Natural",
+    "topic": "Topic",
+    "verses": "Verses",
+    "concordance": "Concordance",
+    "keyword": "Keyword",
+}
+MODE_ABBREV = {
+    "natural": "Nat",
+    "topic": "Top",
+    "verses": "Ver",
+    "concordance": "Con",
+    "keyword": "Key",
+}
+
+
+def mode_label(m: str) -> str:
+    return MODE_LABELS.get(m, m)
+
+
+def prompt_label(m: str, style: str) -> str:
+    """Prompt prefix for mode m; style is abbr | emoji | none."""
+    if style == "emoji":
+        return "🦉"
+    if style == "none":
+        return ""
+    # default: abbreviation per mode
+    return MODE_ABBREV.get(m) or m[:3].title()
+
+
+# Punctuation dropped from words by the root-panel heuristic (one C-level pass)
+_PUNCT_TBL = str.maketrans("", "", ".,!?;:\"'()[]{}")
+_ROOT_LEADS = frozenset(("define", "explain", "meaning"))
+_ROOT_WHAT_VERBS = frozenset(("is", "are", "does"))
+
+
+def _is_root_query(query: str) -> bool:
+    """Auto root-panel heuristic: short, keyword-centric prompts, not commands."""
+    s = (query or "").strip()
+    if not s or s[0] in ("/", "@", "#", "&", "!", "~"):
+        return False
+    toks = s.split()
+    if len(toks) == 1:
+        return True
+    if len(toks) > 4:
+        return False
+    first = toks[0].translate(_PUNCT_TBL).lower()
+    if first in _ROOT_LEADS:
+        return True
+    return first == "what" and toks[1].translate(_PUNCT_TBL).lower() in _ROOT_WHAT_VERBS
+
+
 def ensure_dirs() -> None:
     APP_DATA_DIR.mkdir(parents=True, exist_ok=True)
     HISTORY_FILE_PATH.touch(exist_ok=True)
 
 
-def interactive_model_picker(models: list[str], current: Optional[str] = None) -> Optional[str]:
-    """Interactive arrow-key picker using curses. Returns selected model, or None if cancelled.
+def _curses_pick(title: str, labels: List[str], sel: int) -> Optional[int]:
+    """Arrow-key list picker; returns the chosen index, or None if cancelled.
 
-    Falls back to None if curses or TTY is unavailable.
+    The list is drawn once; a move redraws only the old and new selected rows.
     """
-    if not models:
-        return None
-    if curses is None or not sys.stdin.isatty() or not sys.stdout.isatty():
-        return None
-
     def _ui(stdscr):
+        nonlocal sel
         curses.curs_set(0)
         stdscr.nodelay(False)
         stdscr.keypad(True)
-        sel = 0
-        if current and current in models:
-            sel = models.index(current)
-        while True:
-            stdscr.clear()
-            h, w = stdscr.getmaxyx()
-            title = "Select Ollama Model (↑/↓, Enter=confirm, Esc=cancel)"
-            stdscr.addnstr(0, 0, title, w - 1, curses.A_BOLD)
-            for i, m in enumerate(models):
+
+        def draw_row(i: int) -> None:
+            if i < rows:
                 marker = "→ " if i == sel else "  "
-                suffix = "  (current)" if current and m == current else ""
-                line = f"{marker}{m}{suffix}"
                 attr = curses.A_REVERSE if i == sel else curses.A_NORMAL
-                if 1 + i < h - 1:
-                    stdscr.addnstr(1 + i, 0, line, w - 1, attr)
+                stdscr.addnstr(1 + i, 0, f"{marker}{labels[i]}", w - 1, attr)
+                stdscr.clrtoeol()
+
+        def draw_all() -> None:
+            nonlocal h, w, rows
+            h, w = stdscr.getmaxyx()
+            rows = min(len(labels), h - 2)
+            stdscr.erase()
+            stdscr.addnstr(0, 0, title, w - 1, curses.A_BOLD)
+            for i in range(rows):
+                draw_row(i)
+
+        h = w = rows = 0
+        draw_all()
+        while True:
             stdscr.refresh()
             ch = stdscr.getch()
+            old = sel
             if ch in (curses.KEY_UP, ord('k')):
-                sel = (sel - 1) % len(models)
+                sel = (sel - 1) % len(labels)
             elif ch in (curses.KEY_DOWN, ord('j')):
-                sel = (sel + 1) % len(models)
+                sel = (sel + 1) % len(labels)
             elif ch in (curses.KEY_ENTER, 10, 13):
-                return models[sel]
+                return sel
             elif ch in (27, ord('q')):
                 return None
+            elif ch == curses.KEY_RESIZE:
+                draw_all()
+                continue
+            draw_row(old)
+            draw_row(sel)
 
     try:
         return curses.wrapper(_ui)
@@ -118,50 +375,34 @@ def interactive_model_picker(models: list[str], current: Optional[str] = None) -
         return None
 
 
-def interactive_mode_picker(modes: list[str], current: Optional[str] = None) -> Optional[str]:
-    """Interactive arrow-key picker for modes. Returns selected mode or None.
+def interactive_model_picker(models: list[str], current: Optional[str] = None) -> Optional[str]:
+    """Interactive arrow-key picker using curses. Returns selected model, or None if cancelled.
 
     Falls back to None if curses or TTY is unavailable.
     """
-    if not modes:
+    if not models:
         return None
     if curses is None or not sys.stdin.isatty() or not sys.stdout.isatty():
         return None
+    sel = models.index(current) if current and current in models else 0
+    labels = [f"{m}{'  (current)' if current and m == current else ''}" for m in models]
+    idx = _curses_pick("Select Ollama Model (↑/↓, Enter=confirm, Esc=cancel)", labels, sel)
+    return None if idx is None else models[idx]
 
-    def _ui(stdscr):
-        curses.curs_set(0)
-        stdscr.nodelay(False)
-        stdscr.keypad(True)
-        sel = 0
-        if current and current in modes:
-            sel = modes.index(current)
-        while True:
-            stdscr.clear()
-            h, w = stdscr.getmaxyx()
-            title = "Select Mode (↑/↓, Enter=confirm, Esc=cancel)"
-            stdscr.addnstr(0, 0, title, w - 1, curses.A_BOLD)
-            for i, m in enumerate(modes):
-                marker = "→ " if i == sel else "  "
-                suffix = "  (current)" if current and m == current else ""
-                line = f"{marker}{m.title()}{suffix}"
-                attr = curses.A_REVERSE if i == sel else curses.A_NORMAL
-                if 1 + i < h - 1:
-                    stdscr.addnstr(1 + i, 0, line, w - 1, attr)
-            stdscr.refresh()
-            ch = stdscr.getch()
-            if ch in (curses.KEY_UP, ord('k')):
-                sel = (sel - 1) % len(modes)
-            elif ch in (curses.KEY_DOWN, ord('j')):
-                sel = (sel + 1) % len(modes)
-            elif ch in (curses.KEY_ENTER, 10, 13):
-                return modes[sel]
-            elif ch in (27, ord('q')):
-                return None
 
-    try:
-        return curses.wrapper(_ui)
-    except Exception:
+def interactive_mode_picker(modes: list[str], current: Optional[str] = None) -> Optional[str]:
+    """Interactive arrow-key picker for modes. Returns selected mode or None.
+
+    Falls back to None if curses or TTY is unavailable.
+    """
+    if not modes:
+        return None
+    if curses is None or not sys.stdin.isatty() or not sys.stdout.isatty():
         return None
+    sel = modes.index(current) if current and current in modes else 0
+    labels = [f"{m.title()}{'  (current)' if current and m == current else ''}" for m in modes]
+    idx = _curses_pick("Select Mode (↑/↓, Enter=confirm, Esc=cancel)", labels, sel)
+    return None if idx is None else modes[idx]
 
 
 def main() -> None:
@@ -171,19 +412,35 @@ def main() -> None:
         readline.read_history_file(HISTORY_FILE_PATH)
     except FileNotFoundError:
         pass
+    # On exit append only this session's lines; append_history_file also trims
+    # the file to the history length, so it never grows without bound
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(_append_history, readline.get_current_history_length())
 
     typeahead = TypeaheadEngine()
+    # Load the concordance index behind the banner; first use waits on it
+    threading.Thread(target=_preload_typeahead, args=(typeahead,), daemon=True).start()
     db = DatabaseManager()
+    settings = load_settings()
+    if settings.get("warmup_db", True):
+        # Readahead hints only; set "warmup_db": false where page cache is scarce
+        threading.Thread(target=db.prefetch, daemon=True).start()
     start_load = time.perf_counter()
     with console.status("Initializing lookup indexes…", spinner="dots"):
-        db.load_fast_lookup()
+        # Probe Ollama (later calls reuse the result) and open the OSIS config
+        # and chat history while the lookup tables load on this thread
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="tinyowl-start") as ex:
+            ex.submit(ollama_available)
+            osis_future = ex.submit(OsisHelper)
+            history_future = ex.submit(ChatHistory)
+            db.load_fast_lookup()
+            db.warm()
+        osis = osis_future.result()
+        history = history_future.result()
     console.print(f"[dim]Ready in {(time.perf_counter()-start_load)*1000:.0f} ms[/dim]")
-    osis = OsisHelper()
-    history = ChatHistory()
 
-    settings = load_settings()
     # Default to saved settings; if none, start with Ollama availability and default model
-    ai_enabled = settings.get("default_ai_enabled", check_ollama())
+    ai_enabled = settings["default_ai_enabled"] if "default_ai_enabled" in settings else ollama_available()
     ai_model = settings.get("default_ai_model", DEFAULT_AI_MODEL)
     # Modes: natural (default), topic, verses, concordance, keyword
     mode: str = settings.get("default_mode", "natural").lower()
@@ -198,424 +455,517 @@ def main() -> None:
 
     console.print("TinyOwl Chat (CLI)")
     console.print("Type '/help' for commands. 'Ctrl+C' to exit.")
-    def mode_label(m: str) -> str:
-        labels = {
-            "natural": "Natural",
-            "topic": "Topic",
-            "verses": "Verses",
-            "concordance": "Concordance",
-            "keyword": "Keyword",
-        }
-        return labels.get(m, m)
-
-    def mode_abbrev(m: str) -> str:
-        return {
-            "natural": "Nat",
-            "topic": "Top",
-            "verses": "Ver",
-            "concordance": "Con",
-            "keyword": "Key",
-        }.get(m, m[:3].title())
-
-    def prompt_label(m: str) -> str:
-        style = settings.get("prompt_style", "abbr").lower()  # abbr | emoji | none
-        if style == "emoji":
-            return "🦉"
-        if style == "none":
-            return ""
-        # default: abbreviation per mode
-        return mode_abbrev(m)
+    # Read per prompt; refreshed by /prompt
+    prompt_style: str = settings.get("prompt_style", "abbr").lower()
+
+    # Refreshed by /root
+    root_display: str = settings.get("root_display", "auto").lower()  # auto | always | off
 
     def should_show_root_panel(query: str) -> bool:
-        mode_setting = settings.get("root_display", "auto").lower()  # auto | always | off
-        if mode_setting == "off":
-            return False
-        if mode_setting == "always":
-            return True
-        # auto heuristic: short, keyword-centric prompts, not commands
-        s = (query or "").strip()
-        if not s or s[0] in ("/", "@", "#", "&", "!", "~"):
+        if root_display == "off":
             return False
-        toks = [t.strip(".,!?;:\"'()[]{}").lower() for t in s.split() if t.strip()]
-        if len(toks) <= 1:
-            return True
-        if len(toks) <= 4 and ((toks[0] == "what" and len(toks) >= 2 and toks[1] in {"is","are","does"}) or toks[0] in {"define","explain","meaning"}):
-            return True
-        return False
+        return root_display == "always" or _is_root_query(query)
 
-    def show_status() -> None:
+    def show_status(refresh: bool = False) -> None:
         console.print(
-            f"[dim]Mode: {mode_label(mode)} | AI: {'ON' if ai_enabled else 'OFF'} | Model: {ai_model} | Ollama: {'YES' if check_ollama() else 'NO'} @ {OLLAMA_HOST}[/dim]"
+            f"[dim]Mode: {mode_label(mode)} | AI: {'ON' if ai_enabled else 'OFF'} | Model: {ai_model} | Ollama: {'YES' if ollama_available(refresh) else 'NO'} @ {OLLAMA_HOST}[/dim]"
         )
     show_status()
 
-    last_results_cache: Dict[str, Any] = {}
+    # /ai subcommands: action -> handler(sub), where sub is the split command
+    def ai_help(sub: List[str]) -> None:
+        console.print(
+            """
+/ai help            Show this help
+/ai status          Show AI toggle, Ollama availability, and current model
+/ai on|off|toggle   Control AI enhancement
+/ai models          List installed models (numbered; marks current)
+/ai model <name>    Switch model (name, number, or partial)
+/ai model           Pick interactively (enter number or name)
+/ai default [name]  Save defaults for future sessions (current or given name)
+            """.strip()
+        )
 
-    while True:
-        try:
-            label = prompt_label(mode)
-            prefix = f"{label} > " if label else "> "
-            line = input(f"\n{prefix}").strip()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\nGoodbye!")
-            break
+    def ai_set_enabled(enabled: Optional[bool]) -> Callable[[List[str]], None]:
+        def handler(sub: List[str]) -> None:
+            nonlocal ai_enabled
+            ai_enabled = (not ai_enabled) if enabled is None else enabled
+            history.update_session_ai_enabled(session_id, ai_enabled)
+            show_status(refresh=True)
+        return handler
 
-        if not line:
-            continue
+    def ai_status(sub: List[str]) -> None:
+        show_status(refresh=True)
 
-        parsed = parse_command(line)
+    def ai_models(sub: List[str]) -> None:
+        with console.status("Querying Ollama for models…", spinner="dots"):
+            models = cached_models(force=True)
+        if not models:
+            console.print("No models found or Ollama unavailable.")
+        else:
+            lines = [f"[{i+1}] {m}{'  (current)' if m == ai_model else ''}" for i, m in enumerate(models)]
+            console.print("Available models:\n" + "\n".join(lines))
 
-        if parsed.kind == "slash":
-            cmd = parsed.value
-            if cmd in ("help",):
-                console.print(
-                    "Commands:\n"
-                    "  /help, /history, /export, /clear, /stats\n"
-                    "  /mode [name|help|status|default], /ai on|off|toggle|status|models|model <name>|default|help\n"
-                    "  /model, /prompt [emoji|abbr|none]\n"
-                    "\nSearches:\n"
-                    "  @word      - Concordance lookup\n"
-                    "  @strong:N  - Strong's number lookup\n"
-                    "  &verse     - Direct verse reference (e.g., &John 3:16)\n"
-                    "  #topic     - Semantic topical search\n"
-                    "  !keyword   - Lexical keyword search\n"
-                    "  ~word      - Find semantically similar words\n"
-                    "  ~concept A+B-C - Concept vector (positives minus negatives)\n"
-                    "  ~analogy A-B+C - Analogy-style vector math"
-                )
-                continue
-            # Short alias for model switching: `/model` acts like `/ai model`
-            if cmd == "model" or cmd.startswith("model "):
-                cmd = "ai model" + (" " + cmd[len("model"):].strip() if len(cmd) > len("model") else "")
-            # Prompt style commands
-            if cmd.startswith("prompt"):
-                parts = cmd.split()
-                current = settings.get("prompt_style", "abbr")
-                if len(parts) == 1 or parts[1] in ("help", "status"):
-                    console.print(f"[dim]Prompt style: {current} (options: emoji, abbr, none)[/dim]")
-                    continue
-                choice = parts[1].lower()
-                if choice not in ("emoji", "abbr", "none"):
-                    print_error("Invalid prompt style. Use: /prompt emoji|abbr|none")
-                    continue
-                settings["prompt_style"] = choice
-                save_settings(settings)
-                console.print(f"[dim]Prompt style saved: {choice}[/dim]")
-                show_status()
-                continue
-            # Mode commands
-            if cmd.startswith("mode"):
-                parts = cmd.split()
-                # If no sub-arg, open interactive picker instead of status
-                if len(parts) == 1:
-                    picked = interactive_mode_picker(valid_modes, current=mode)
-                    if picked:
-                        mode = picked
+    def ai_model_switch(sub: List[str]) -> None:
+        nonlocal ai_model
+        models = cached_models()
+        if not models:
+            console.print("No models found or Ollama unavailable.")
+            return
+        # If no argument, try interactive picker first
+        if len(sub) < 3:
+            choice = interactive_model_picker(models, current=ai_model)
+            if not choice:
+                lines = [f"[{i+1}] {m}{'  (current)' if m == ai_model else ''}" for i, m in enumerate(models)]
+                console.print("Select a model by number or name:\n" + "\n".join(lines))
+                try:
+                    choice = input("Model > ").strip()
+                except (EOFError, KeyboardInterrupt):
+                    console.print("\n[dim]Cancelled[/dim]")
+                    return
+        else:
+            choice = " ".join(sub[2:]).strip()
+
+        # Allow numeric index
+        new_model = None
+        if choice and choice.isdigit():
+            idx = int(choice) - 1
+            if 0 <= idx < len(models):
+                new_model = models[idx]
+        # Try exact match
+        if new_model is None and choice in models:
+            new_model = choice
+        if new_model is None and choice:
+            # Case-insensitive name: one probe of a lowercase index; names that
+            # differ only by case stay together and are reported as ambiguous
+            by_lower: Dict[str, List[str]] = {}
+            for m in models:
+                by_lower.setdefault(m.lower(), []).append(m)
+            want = choice.lower()
+            exact = by_lower.get(want, [])
+            if len(exact) == 1:
+                new_model = exact[0]
+        # Fuzzy: case-insensitive substring, prefer unique
+        if new_model is None and choice:
+            matches = exact or [m for low, names in by_lower.items() if want in low for m in names]
+            if len(matches) == 1:
+                new_model = matches[0]
+            elif len(matches) > 1:
+                console.print("Ambiguous model name. Matches:\n- " + "\n- ".join(matches))
+                return
+        if not new_model:
+            console.print("Model not found.")
+            return
+        ai_model = new_model
+        history.update_session_ai_model(session_id, ai_model)
+        console.print(f"AI model set to: {ai_model}")
+        show_status(refresh=True)
+
+    def ai_default(sub: List[str]) -> None:
+        # Persist current or provided model and enabled flag for future sessions
+        desired = ai_model
+        if len(sub) >= 3:
+            desired = " ".join(sub[2:]).strip()
+        # Save without strict validation to allow setting before pulling
+        settings["default_ai_model"] = desired
+        settings["default_ai_enabled"] = ai_enabled
+        save_settings(settings)
+        console.print(f"Saved defaults: model={desired}, enabled={'ON' if ai_enabled else 'OFF'}")
+        show_status()
+
+    ai_actions: Dict[str, Callable[[List[str]], None]] = {
+        "help": ai_help,
+        "toggle": ai_set_enabled(None),
+        "on": ai_set_enabled(True),
+        "off": ai_set_enabled(False),
+        "status": ai_status,
+        "models": ai_models,
+        "model": ai_model_switch,
+        "default": ai_default,
+    }
+
+    last_results_cache: Dict[str, Any] = {}
+
+    # One handler per command kind; each reads the REPL state above
+    def handle_slash(value: str) -> None:
+        nonlocal mode, prompt_style, root_display
+        cmd = value
+        if cmd in ("help",):
+            console.print(
+                "Commands:\n"
+                "  /help, /history, /export, /clear, /stats\n"
+                "  /mode [name|help|status|default], /ai on|off|toggle|status|models|model <name>|default|help\n"
+                "  /model, /prompt [emoji|abbr|none]\n"
+                "\nSearches:\n"
+                "  @word      - Concordance lookup\n"
+                "  @strong:N  - Strong's number lookup\n"
+                "  &verse     - Direct verse reference (e.g., &John 3:16)\n"
+                "  #topic     - Semantic topical search\n"
+                "  !keyword   - Lexical keyword search\n"
+                "  ~word      - Find semantically similar words\n"
+                "  ~concept A+B-C - Concept vector (positives minus negatives)\n"
+                "  ~analogy A-B+C - Analogy-style vector math"
+            )
+            return
+        # Short alias for model switching: `/model` acts like `/ai model`
+        if cmd == "model" or cmd.startswith("model "):
+            cmd = "ai model" + (" " + cmd[len("model"):].strip() if len(cmd) > len("model") else "")
+        # Prompt style commands
+        if cmd.startswith("prompt"):
+            parts = cmd.split()
+            current = settings.get("prompt_style", "abbr")
+            if len(parts) == 1 or parts[1] in ("help", "status"):
+                console.print(f"[dim]Prompt style: {current} (options: emoji, abbr, none)[/dim]")
+                return
+            choice = parts[1].lower()
+            if choice not in ("emoji", "abbr", "none"):
+                print_error("Invalid prompt style. Use: /prompt emoji|abbr|none")
+                return
+            settings["prompt_style"] = prompt_style = choice
+            save_settings(settings)
+            console.print(f"[dim]Prompt style saved: {choice}[/dim]")
+            show_status()
+            return
+        # Mode commands
+        if cmd.startswith("mode"):
+            parts = cmd.split()
+            # If no sub-arg, open interactive picker instead of status
+            if len(parts) == 1:
+                picked = interactive_mode_picker(valid_modes, current=mode)
+                if picked:
+                    mode = picked
+                    console.print(f"Mode set to: {mode_label(mode)}")
+                    show_status()
+                    return
+                # Explain why picker didn't appear
+                try:
+                    import sys as _sys
+                    if curses is None:
+                        console.print("[dim]Interactive picker unavailable: curses not available[/dim]")
+                    elif not (_sys.stdin.isatty() and _sys.stdout.isatty()):
+                        console.print("[dim]Interactive picker unavailable: not running in a TTY[/dim]")
+                except Exception:
+                    pass
+                # Fallback to simple numeric prompt
+                options = [mode_label(m) for m in valid_modes]
+                console.print("Select mode:\n" + "\n".join(f"[{i+1}] {opt}{'  (current)' if valid_modes[i]==mode else ''}" for i,opt in enumerate(options)))
+                try:
+                    choice = input("Mode > ").strip()
+                except (EOFError, KeyboardInterrupt):
+                    console.print("\n[dim]Cancelled[/dim]")
+                    return
+                if choice.isdigit():
+                    idx = int(choice) - 1
+                    if 0 <= idx < len(valid_modes):
+                        mode = valid_modes[idx]
+                        console.print(f"Mode set to: {mode_label(mode)}")
+                        show_status()
+                    else:
+                        console.print("Invalid selection.")
+                else:
+                    nm = choice.lower()
+                    if nm in valid_modes:
+                        mode = nm
                         console.print(f"Mode set to: {mode_label(mode)}")
                         show_status()
-                        continue
-                    # Explain why picker didn't appear
-                    try:
-                        import sys as _sys
-                        if curses is None:
-                            console.print("[dim]Interactive picker unavailable: curses not available[/dim]")
-                        elif not (_sys.stdin.isatty() and _sys.stdout.isatty()):
-                            console.print("[dim]Interactive picker unavailable: not running in a TTY[/dim]")
-                    except Exception:
-                        pass
-                    # Fallback to simple numeric prompt
-                    options = [mode_label(m) for m in valid_modes]
-                    console.print("Select mode:\n" + "\n".join(f"[{i+1}] {opt}{'  (current)' if valid_modes[i]==mode else ''}" for i,opt in enumerate(options)))
-                    try:
-                        choice = input("Mode > ").strip()
-                    except (EOFError, KeyboardInterrupt):
-                        console.print("\n[dim]Cancelled[/dim]")
-                        continue
-                    if choice.isdigit():
-                        idx = int(choice) - 1
-                        if 0 <= idx < len(valid_modes):
-                            mode = valid_modes[idx]
-                            console.print(f"Mode set to: {mode_label(mode)}")
-                            show_status()
-                        else:
-                            console.print("Invalid selection.")
                     else:
-                        nm = choice.lower()
-                        if nm in valid_modes:
-                            mode = nm
-                            console.print(f"Mode set to: {mode_label(mode)}")
-                            show_status()
-                        else:
-                            console.print("Invalid mode name.")
-                    continue
-
-                # Otherwise parse sub-commands
-                sub = parts[1].lower()
-                if sub == "help":
-                    console.print(
-                        """
+                        console.print("Invalid mode name.")
+                return
+
+            # Otherwise parse sub-commands
+            sub = parts[1].lower()
+            if sub == "help":
+                console.print(
+                    """
 /mode                 Show current mode
 /mode help            Show this help
 /mode status          Show current mode and hint
 /mode <name>          Set mode (natural, topic, verses, concordance, keyword)
 /mode default [name]  Save default mode for future sessions
-                        """.strip()
-                    )
-                    continue
-                if sub == "status":
-                    console.print(f"Current mode: [bold]{mode_label(mode)}[/bold]")
-                    if mode == "natural":
-                        console.print("Type questions normally (e.g., Why is Sabbath important?).")
-                    elif mode == "topic":
-                        console.print("Topical search across sources. Type keywords or short phrases.")
-                    elif mode == "verses":
-                        console.print("Verse lookup (e.g., John 3:16 or Gen 1:1-3).")
-                    elif mode == "concordance":
-                        console.print("Concordance mode. Type a word to see occurrences and contexts.")
-                    elif mode == "keyword":
-                        console.print("Keyword mode. Full-text lexical search across translations.")
-                    continue
-                if sub == "default":
-                    new_mode = parts[2].lower() if len(parts) > 2 else mode
-                    if new_mode not in valid_modes:
-                        console.print("Invalid mode. Use one of: natural, topic, verses, concordance, keyword")
-                        continue
-                    settings["default_mode"] = new_mode
-                    save_settings(settings)
-                    console.print(f"Saved default mode: {mode_label(new_mode)}")
-                    continue
-                # Interactive picker if no name supplied
-                if len(parts) == 1:
-                    # Try curses-based interactive picker first
-                    picked = interactive_mode_picker(valid_modes, current=mode)
-                    if picked:
-                        mode = picked
+                    """.strip()
+                )
+                return
+            if sub == "status":
+                console.print(f"Current mode: [bold]{mode_label(mode)}[/bold]")
+                if mode == "natural":
+                    console.print("Type questions normally (e.g., Why is Sabbath important?).")
+                elif mode == "topic":
+                    console.print("Topical search across sources. Type keywords or short phrases.")
+                elif mode == "verses":
+                    console.print("Verse lookup (e.g., John 3:16 or Gen 1:1-3).")
+                elif mode == "concordance":
+                    console.print("Concordance mode. Type a word to see occurrences and contexts.")
+                elif mode == "keyword":
+                    console.print("Keyword mode. Full-text lexical search across translations.")
+                return
+            if sub == "default":
+                new_mode = parts[2].lower() if len(parts) > 2 else mode
+                if new_mode not in valid_modes:
+                    console.print("Invalid mode. Use one of: natural, topic, verses, concordance, keyword")
+                    return
+                settings["default_mode"] = new_mode
+                save_settings(settings)
+                console.print(f"Saved default mode: {mode_label(new_mode)}")
+                return
+            # Interactive picker if no name supplied
+            if len(parts) == 1:
+                # Try curses-based interactive picker first
+                picked = interactive_mode_picker(valid_modes, current=mode)
+                if picked:
+                    mode = picked
+                    console.print(f"Mode set to: {mode_label(mode)}")
+                    show_status()
+                    return
+                # Explain why picker didn't appear
+                try:
+                    import sys as _sys
+                    if curses is None:
+                        console.print("[dim]Interactive picker unavailable: curses not available[/dim]")
+                    elif not (_sys.stdin.isatty() and _sys.stdout.isatty()):
+                        console.print("[dim]Interactive picker unavailable: not running in a TTY[/dim]")
+                except Exception:
+                    pass
+                # Fallback to simple numeric prompt
+                options = [mode_label(m) for m in valid_modes]
+                console.print("Select mode:\n" + "\n".join(f"[{i+1}] {opt}{'  (current)' if valid_modes[i]==mode else ''}" for i,opt in enumerate(options)))
+                try:
+                    choice = input("Mode > ").strip()
+                except (EOFError, KeyboardInterrupt):
+                    console.print("\n[dim]Cancelled[/dim]")
+                    return
+                if choice.isdigit():
+                    idx = int(choice) - 1
+                    if 0 <= idx < len(valid_modes):
+                        mode = valid_modes[idx]
                         console.print(f"Mode set to: {mode_label(mode)}")
                         show_status()
-                        continue
-                    # Explain why picker didn't appear
-                    try:
-                        import sys as _sys
-                        if curses is None:
-                            console.print("[dim]Interactive picker unavailable: curses not available[/dim]")
-                        elif not (_sys.stdin.isatty() and _sys.stdout.isatty()):
-                            console.print("[dim]Interactive picker unavailable: not running in a TTY[/dim]")
-                    except Exception:
-                        pass
-                    # Fallback to simple numeric prompt
-                    options = [mode_label(m) for m in valid_modes]
-                    console.print("Select mode:\n" + "\n".join(f"[{i+1}] {opt}{'  (current)' if valid_modes[i]==mode else ''}" for i,opt in enumerate(options)))
-                    try:
-                        choice = input("Mode > ").strip()
-                    except (EOFError, KeyboardInterrupt):
-                        console.print("\n[dim]Cancelled[/dim]")
-                        continue
-                    if choice.isdigit():
-                        idx = int(choice) - 1
-                        if 0 <= idx < len(valid_modes):
-                            mode = valid_modes[idx]
-                            console.print(f"Mode set to: {mode_label(mode)}")
-                            show_status()
-                        else:
-                            console.print("Invalid selection.")
                     else:
-                        nm = choice.lower()
-                        if nm in valid_modes:
-                            mode = nm
-                            console.print(f"Mode set to: {mode_label(mode)}")
-                            show_status()
-                        else:
-                            console.print("Invalid mode name.")
-                    continue
-                # Direct set
-                name = parts[1].lower()
-                if name not in valid_modes:
-                    console.print("Invalid mode. Use: natural, topic, verses, concordance, keyword")
-                    continue
-                mode = name
-                console.print(f"Mode set to: {mode_label(mode)}")
-                show_status()
-                continue
-            if cmd.startswith("ai"):
-                sub = cmd.split()
-                action = sub[1] if len(sub) > 1 else "status"
-                if action == "help":
-                    console.print(
-                        """
-/ai help            Show this help
-/ai status          Show AI toggle, Ollama availability, and current model
-/ai on|off|toggle   Control AI enhancement
-/ai models          List installed models (numbered; marks current)
-/ai model <name>    Switch model (name, number, or partial)
-/ai model           Pick interactively (enter number or name)
-/ai default [name]  Save defaults for future sessions (current or given name)
-                        """.strip()
-                    )
-                    continue
-                if action == "toggle":
-                    ai_enabled = not ai_enabled
-                    history.update_session_ai_enabled(session_id, ai_enabled)
-                    show_status()
-                    continue
-                if action == "on":
-                    ai_enabled = True
-                    history.update_session_ai_enabled(session_id, True)
-                    show_status()
-                    continue
-                if action == "off":
-                    ai_enabled = False
-                    history.update_session_ai_enabled(session_id, False)
-                    show_status()
-                    continue
-                if action == "status":
-                    show_status()
-                    continue
-                if action == "models":
-                    with console.status("Querying Ollama for models…", spinner="dots"):
-                        models = list_models()
-                    if not models:
-                        console.print("No models found or Ollama unavailable.")
-                    else:
-                        lines = [f"[{i+1}] {m}{'  (current)' if m == ai_model else ''}" for i, m in enumerate(models)]
-                        console.print("Available models:\n" + "\n".join(lines))
-                    continue
-                if action == "model":
-                    models = list_models()
-                    if not models:
-                        console.print("No models found or Ollama unavailable.")
-                        continue
-                    # If no argument, try interactive picker first
-                    if len(sub) < 3:
-                        choice = interactive_model_picker(models, current=ai_model)
-                        if not choice:
-                            lines = [f"[{i+1}] {m}{'  (current)' if m == ai_model else ''}" for i, m in enumerate(models)]
-                            console.print("Select a model by number or name:\n" + "\n".join(lines))
-                            try:
-                                choice = input("Model > ").strip()
-                            except (EOFError, KeyboardInterrupt):
-                                console.print("\n[dim]Cancelled[/dim]")
-                                continue
+                        console.print("Invalid selection.")
+                else:
+                    nm = choice.lower()
+                    if nm in valid_modes:
+                        mode = nm
+                        console.print(f"Mode set to: {mode_label(mode)}")
+                        show_status()
                     else:
-                        choice = " ".join(sub[2:]).strip()
-
-                    # Allow numeric index
-                    new_model = None
-                    if choice and choice.isdigit():
-                        idx = int(choice) - 1
-                        if 0 <= idx < len(models):
-                            new_model = models[idx]
-                    # Try exact match
-                    if new_model is None and choice in models:
-                        new_model = choice
-                    # Fuzzy: case-insensitive substring, prefer unique
-                    if new_model is None and choice:
-                        matches = [m for m in models if choice.lower() in m.lower()]
-                        if len(matches) == 1:
-                            new_model = matches[0]
-                        elif len(matches) > 1:
-                            console.print("Ambiguous model name. Matches:\n- " + "\n- ".join(matches))
-                            continue
-                    if not new_model:
-                        console.print("Model not found.")
-                        continue
-                    ai_model = new_model
-                    history.update_session_ai_model(session_id, ai_model)
-                    console.print(f"AI model set to: {ai_model}")
-                    show_status()
-                    continue
-                if action == "default":
-                    # Persist current or provided model and enabled flag for future sessions
-                    desired = ai_model
-                    if len(sub) >= 3:
-                        desired = " ".join(sub[2:]).strip()
-                    # Save without strict validation to allow setting before pulling
-                    settings["default_ai_model"] = desired
-                    settings["default_ai_enabled"] = ai_enabled
-                    save_settings(settings)
-                    console.print(f"Saved defaults: model={desired}, enabled={'ON' if ai_enabled else 'OFF'}")
-                    show_status()
-                    continue
+                        console.print("Invalid mode name.")
+                return
+            # Direct set
+            name = parts[1].lower()
+            if name not in valid_modes:
+                console.print("Invalid mode. Use: natural, topic, verses, concordance, keyword")
+                return
+            mode = name
+            console.print(f"Mode set to: {mode_label(mode)}")
+            show_status()
+            return
+        if cmd.startswith("ai"):
+            sub = cmd.split()
+            handler = ai_actions.get(sub[1] if len(sub) > 1 else "status")
+            if handler is None:
                 console.print("Unknown /ai subcommand. Try /ai status")
-                continue
-            if cmd == "gpu":
-                info = db.device_info()
-                console.print("GPU / Embedding Status:")
-                console.print(json.dumps(info, indent=2))
-                # Ollama hints
-                opts = {}
-                num_gpu = os.environ.get("TINYOWL_OLLAMA_NUM_GPU") or os.environ.get("OLLAMA_NUM_GPU")
-                if num_gpu:
-                    opts["num_gpu"] = num_gpu
-                raw = os.environ.get("TINYOWL_OLLAMA_OPTIONS")
-                if raw:
-                    opts["options_env"] = raw
-                if opts:
-                    console.print("Ollama options (env):")
-                    console.print(json.dumps(opts, indent=2))
-                else:
-                    console.print("[dim]No Ollama GPU options set (optional)[/dim]")
-                continue
-            if cmd.startswith("root"):
-                parts = cmd.split()
-                cur = settings.get("root_display", "auto")
-                if len(parts) == 1 or parts[1] in ("help","status"):
-                    console.print(f"[dim]Root panel: {cur} (options: auto, always, off)[/dim]")
-                    continue
-                choice = parts[1].lower()
-                if choice not in ("auto","always","off"):
-                    print_error("Invalid root setting. Use: /root auto|always|off")
-                    continue
-                settings["root_display"] = choice
-                save_settings(settings)
-                console.print(f"[dim]Root panel saved: {choice}[/dim]")
-                continue
-            if cmd == "history":
-                start = time.perf_counter()
-                with console.status("Loading history…", spinner="dots"):
-                    sessions = history.recent_sessions(limit=10)
-                for sid, created, ai in sessions:
-                    console.print(f"Session {sid} — {created} — AI={'ON' if ai else 'OFF'}")
-                console.print(f"[dim]Loaded in {(time.perf_counter()-start)*1000:.0f} ms[/dim]")
-                continue
-            if cmd.startswith("export"):
-                from .config import EXPORTS_DIR
-                EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
-                with console.status("Exporting…", spinner="dots"):
-                    msgs = history.get_session_messages(session_id)
-                out = []
-                for role, content, ts in msgs:
-                    out.append({"role": role, "content": content, "time": ts})
-                path = EXPORTS_DIR / f"session_{session_id}.json"
-                start = time.perf_counter()
-                path.write_text(json.dumps(out, indent=2))
-                console.print(f"Exported to {path} [dim]{(time.perf_counter()-start)*1000:.0f} ms[/dim]")
-                continue
-            if cmd == "clear":
-                os.system("clear")
-                continue
-            if cmd == "stats":
-                st = db.stats()
-                console.print(json.dumps(st, indent=2))
-                continue
-            console.print("Unknown command. Try /help")
-            continue
+            else:
+                handler(sub)
+            return
+        if cmd == "gpu":
+            info = db.device_info()
+            console.print("GPU / Embedding Status:")
+            console.print(json.dumps(info, indent=2))
+            # Ollama hints
+            opts = {}
+            num_gpu = os.environ.get("TINYOWL_OLLAMA_NUM_GPU") or os.environ.get("OLLAMA_NUM_GPU")
+            if num_gpu:
+                opts["num_gpu"] = num_gpu
+            raw = os.environ.get("TINYOWL_OLLAMA_OPTIONS")
+            if raw:
+                opts["options_env"] = raw
+            if opts:
+                console.print("Ollama options (env):")
+                console.print(json.dumps(opts, indent=2))
+            else:
+                console.print("[dim]No Ollama GPU options set (optional)[/dim]")
+            return
+        if cmd.startswith("root"):
+            parts = cmd.split()
+            cur = settings.get("root_display", "auto")
+            if len(parts) == 1 or parts[1] in ("help","status"):
+                console.print(f"[dim]Root panel: {cur} (options: auto, always, off)[/dim]")
+                return
+            choice = parts[1].lower()
+            if choice not in ("auto","always","off"):
+                print_error("Invalid root setting. Use: /root auto|always|off")
+                return
+            settings["root_display"] = root_display = choice
+            save_settings(settings)
+            console.print(f"[dim]Root panel saved: {choice}[/dim]")
+            return
+        if cmd == "history":
+            start = time.perf_counter()
+            with console.status("Loading history…", spinner="dots"):
+                sessions = history.recent_sessions(limit=10)
+            for sid, created, ai in sessions:
+                console.print(f"Session {sid} — {created} — AI={'ON' if ai else 'OFF'}")
+            console.print(f"[dim]Loaded in {(time.perf_counter()-start)*1000:.0f} ms[/dim]")
+            return
+        if cmd.startswith("export"):
+            from .config import EXPORTS_DIR
+            EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+            path = EXPORTS_DIR / f"session_{session_id}.json"
+            start = time.perf_counter()
+            # Rows stream from the cursor into the file one JSON object per line,
+            # so memory stays flat however long the session is
+            dumps = orjson.dumps if orjson is not None else (lambda o: json.dumps(o).encode())
+            with console.status("Exporting…", spinner="dots"), path.open("wb") as f:
+                f.write(b"[")
+                sep = b"\n  "
+                for role, content, ts in history.iter_session_messages(session_id):
+                    f.write(sep)
+                    f.write(dumps({"role": role, "content": content, "time": ts}))
+                    sep = b",\n  "
+                f.write(b"\n]\n")
+            console.print(f"Exported to {path} [dim]{(time.perf_counter()-start)*1000:.0f} ms[/dim]")
+            return
+        if cmd == "clear":
+            console.clear()  # escape sequence; no shell or /usr/bin/clear process
+            return
+        if cmd == "stats":
+            st = db.stats()
+            console.print(json.dumps(st, indent=2))
+            return
+        console.print("Unknown command. Try /help")
 
-        if parsed.kind == "at":
-            val = parsed.value
-            # Strong's number lookup: @strong:175 or @H175/@G3056
-            if val.lower().startswith("strong:") or val.upper().startswith(("H", "G")):
-                num = val.split(":", 1)[1] if ":" in val else val
-                item = db.strongs_lookup(num)
-                if not item:
-                    print_error("No Strong's entry found.")
-                    continue
-                console.print("")
-                console.rule(f"Strong's {item['metadata'].get('strong_number')}")
-                console.print(item.get("content", "(no content)"))
-                history.add_message(session_id, "user", f"@strong:{num}")
-                continue
+    def handle_at(value: str) -> None:
+        nonlocal last_results_cache
+        val = value
+        # Strong's number lookup: @strong:175 or @H175/@G3056
+        num = parse_strongs_ref(val)
+        if num is not None:
+            item = db.strongs_lookup(num)
+            if not item:
+                print_error("No Strong's entry found.")
+                return
+            console.print("")
+            console.rule(f"Strong's {item['metadata'].get('strong_number')}")
+            console.print(item.get("content", "(no content)"))
+            history.add_message(session_id, "user", f"@strong:{num}")
+            return
+
+        word = val
+        if not typeahead.loaded:
+            with console.status("Loading concordance index…", spinner="dots"):
+                typeahead.load()
+        sugs = typeahead.suggest(word, limit=10)
+        print_suggestions([{"term": s.term, "count": s.count} for s in sugs])
+        with console.status("Scanning occurrences…", spinner="dots"):
+            occ = typeahead.occurrences(word, limit=100)
+        print_concordance_results(word, occ, show=5)
+        last_results_cache = {"kind": "concordance", "word": word, "items": occ, "shown": 5}
+        history.add_message(session_id, "user", f"@{word}")
+
+    # '!' keyword lexical search across KJV/WEB verses
+    def handle_bang(value: str) -> None:
+        nonlocal last_results_cache
+        term = value
+        with console.status("Keyword search…", spinner="dots"):
+            items = db.lexical_search(term)
+        print_keyword_results(term, items, show=10)
+        last_results_cache = {"kind": "lexical", "term": term, "items": items, "shown": 10}
+        history.add_message(session_id, "user", f"!{term}")
+
+    def handle_amp(value: str) -> None:
+        ref = value
+        osid = osis.to_osis(ref)
+        if not osid:
+            print_error("Could not parse verse reference. Try 'John 3:16'.")
+            return
+        with console.status("Retrieving verses…", spinner="dots"):
+            verses = db.verse_lookup(osid)
+        if not verses:
+            print_error(f"No verse found for {osid}")
+            return
+        print_verse_results([
+            {"source": v.source, "osis_id": v.osis_id, "text": v.text} for v in verses
+        ])
+        history.add_message(session_id, "user", f"&{ref}")
+
+    def handle_tilde(value: str) -> None:
+        expr = value.strip()
+        expr_lower = expr.lower()
+        is_concept = False
+        is_analogy = False
+        concept_expr = expr
+
+        for prefix in ("analogy ", "concept ", "vector "):
+            if expr_lower.startswith(prefix):
+                is_concept = True
+                if prefix == "analogy ":
+                    is_analogy = True
+                concept_expr = expr[len(prefix):].strip()
+                break
+
+        if not is_concept and any(sym in expr for sym in ('+', '-', ',')):
+            is_concept = True
 
-            word = val
+        if is_concept:
+            if not concept_expr:
+                print_error("Provide at least one word for concept vector (e.g., ~concept love+mercy).")
+                return
+            with console.status("Composing concept vector…", spinner="dots"):
+                concept = db.concept_word_search(concept_expr, limit=10)
+            if is_analogy or expr_lower.startswith("analogy "):
+                print_analogy_results(concept_expr, concept)
+                history.add_message(session_id, "user", f"~analogy {concept_expr}")
+            else:
+                print_concept_similarity(concept_expr, concept)
+                history.add_message(session_id, "user", f"~concept {concept_expr}")
+        else:
+            word = expr
+            with console.status("Finding semantically similar words…", spinner="dots"):
+                similar = db.semantic_word_search(word, limit=10)
+            print_semantic_similarity(word, similar)
+            history.add_message(session_id, "user", f"~{word}")
+
+    def handle_hash(value: str) -> None:
+        q = value
+        with console.status("Searching across sources…", spinner="dots"):
+            results = db.routed_search(q)
+        print_router_results(q, results, show=5)
+        history.add_message(session_id, "user", f"#{q}")
+        if ai_enabled and ollama_available():
+            stream_ai_answer(q, results, ai_model, history, session_id)
+
+    def handle_text(value: str) -> None:
+        nonlocal last_results_cache
+        # Special: paginate concordance results when user types 'more'
+        if value.lower() == "more":
+            if last_results_cache.get("kind") == "concordance":
+                items = last_results_cache.get("items", [])
+                shown = last_results_cache.get("shown", 0)
+                if shown >= len(items):
+                    console.print("[dim]No more results[/dim]")
+                    return
+                show_next = min(shown + 5, len(items))
+                with console.status("Loading more matches…", spinner="dots"):
+                    pass
+                print_concordance_results(last_results_cache.get("word", ""), items, show=show_next, start=shown)
+                last_results_cache["shown"] = show_next
+                return
+            if last_results_cache.get("kind") == "lexical":
+                items = last_results_cache.get("items", [])
+                shown = last_results_cache.get("shown", 0)
+                if shown >= len(items):
+                    console.print("[dim]No more results[/dim]")
+                    return
+                show_next = min(shown + 10, len(items))
+                with console.status("Loading more results…", spinner="dots"):
+                    pass
+                print_keyword_results(last_results_cache.get("term", ""), items, show=show_next, start=shown)
+                last_results_cache["shown"] = show_next
+                return
+        q = value
+        # Mode-driven dispatch
+        if mode == "concordance":
+            word = q
             if not typeahead.loaded:
                 with console.status("Loading concordance index…", spinner="dots"):
                     typeahead.load()
@@ -626,227 +976,88 @@ def main() -> None:
             print_concordance_results(word, occ, show=5)
             last_results_cache = {"kind": "concordance", "word": word, "items": occ, "shown": 5}
             history.add_message(session_id, "user", f"@{word}")
-            continue
-
-        # '!' keyword lexical search across KJV/WEB verses
-        if parsed.kind == "bang":
-            term = parsed.value
+            return
+        if mode == "keyword":
+            term = q
             with console.status("Keyword search…", spinner="dots"):
                 items = db.lexical_search(term)
             print_keyword_results(term, items, show=10)
             last_results_cache = {"kind": "lexical", "term": term, "items": items, "shown": 10}
             history.add_message(session_id, "user", f"!{term}")
-            continue
-
-        if parsed.kind == "amp":
-            ref = parsed.value
+            return
+        if mode == "verses":
+            ref = q
             osid = osis.to_osis(ref)
             if not osid:
                 print_error("Could not parse verse reference. Try 'John 3:16'.")
-                continue
+                return
             with console.status("Retrieving verses…", spinner="dots"):
                 verses = db.verse_lookup(osid)
             if not verses:
                 print_error(f"No verse found for {osid}")
-                continue
+                return
             print_verse_results([
                 {"source": v.source, "osis_id": v.osis_id, "text": v.text} for v in verses
             ])
             history.add_message(session_id, "user", f"&{ref}")
-            continue
+            return
+        # In natural/topic, try to surface Strong's root for a primary keyword first
+        def _extract_primary_keyword(text: str) -> str:
+            stop = {"what","is","the","and","or","of","to","in","a","an","on","for","with","does","do","bible","about","according","who","why","how"}
+            toks = [t.strip(".,!?;:\"'()[]{}").lower() for t in text.split()]
+            cand = [t for t in toks if t.isalpha() and len(t) >= 3 and t not in stop]
+            # Prefer the first candidate
+            return cand[0] if cand else ""
 
-        if parsed.kind == "tilde":
-            expr = parsed.value.strip()
-            expr_lower = expr.lower()
-            is_concept = False
-            is_analogy = False
-            concept_expr = expr
-
-            for prefix in ("analogy ", "concept ", "vector "):
-                if expr_lower.startswith(prefix):
-                    is_concept = True
-                    if prefix == "analogy ":
-                        is_analogy = True
-                    concept_expr = expr[len(prefix):].strip()
-                    break
-
-            if not is_concept and any(sym in expr for sym in ('+', '-', ',')):
-                is_concept = True
+        if should_show_root_panel(q):
+            primary = _extract_primary_keyword(q)
+            if primary:
+                nums = db.get_strongs_for_keyword(primary)
+                if nums:
+                    entries = db.get_strongs_entries(nums)
+                    if entries:
+                        print_strongs_root(primary.upper(), entries)
+        # natural/topic path (both use routed_search with AI enhancement)
+        with console.status("Searching across sources…", spinner="dots"):
+            results = db.routed_search(q)
+        print_router_results(q, results, show=5)
+        history.add_message(session_id, "user", q if mode == "natural" else f"#{q}")
+        if ai_enabled and ollama_available():
+            stream_ai_answer(q, results, ai_model, history, session_id)
 
-            if is_concept:
-                if not concept_expr:
-                    print_error("Provide at least one word for concept vector (e.g., ~concept love+mercy).")
-                    continue
-                with console.status("Composing concept vector…", spinner="dots"):
-                    concept = db.concept_word_search(concept_expr, limit=10)
-                if is_analogy or expr_lower.startswith("analogy "):
-                    print_analogy_results(concept_expr, concept)
-                    history.add_message(session_id, "user", f"~analogy {concept_expr}")
-                else:
-                    print_concept_similarity(concept_expr, concept)
-                    history.add_message(session_id, "user", f"~concept {concept_expr}")
-            else:
-                word = expr
-                with console.status("Finding semantically similar words…", spinner="dots"):
-                    similar = db.semantic_word_search(word, limit=10)
-                print_semantic_similarity(word, similar)
-                history.add_message(session_id, "user", f"~{word}")
-            continue
+    handlers: Dict[str, Callable[[str], None]] = {
+        "slash": handle_slash,
+        "at": handle_at,
+        "bang": handle_bang,
+        "amp": handle_amp,
+        "tilde": handle_tilde,
+        "hash": handle_hash,
+        "text": handle_text,
+    }
+    dispatch = build_dispatcher(handlers)
 
-        if parsed.kind == "hash":
-            q = parsed.value
-            with console.status("Searching across sources…", spinner="dots"):
-                results = db.routed_search(q)
-            print_router_results(q, results, show=5)
-            history.add_message(session_id, "user", f"#{q}")
-            if ai_enabled and check_ollama():
-                ctx = "\n\n".join([f"[{i+1}] {r.get('content','')}" for i, r in enumerate(results[:5])])
-                prompt = (
-                    "You are a theological research assistant. Using ONLY the context provided, answer the query and cite sources by [index].\n\n"
-                    f"Context:\n{ctx}\n\nQuery: {q}\nAnswer:"
-                )
-                console.print("\n[bold green]AI-enhanced summary (streaming):[/bold green]")
-                ai_text = []
-                it = generate_stream(prompt, model=ai_model)
-                first_chunk: Optional[str] = None
-                # Show spinner until first token arrives
-                with console.status(f"AI ({ai_model}) composing…", spinner="dots"):
-                    try:
-                        first_chunk = next(it)
-                    except StopIteration:
-                        first_chunk = None
-                    except KeyboardInterrupt:
-                        console.print("\n[dim]AI streaming interrupted by user[/dim]")
-                        first_chunk = None
-                if first_chunk:
-                    ai_text.append(first_chunk)
-                    console.print(first_chunk, end="")
-                try:
-                    for chunk in it:
-                        ai_text.append(chunk)
-                        console.print(chunk, end="")
-                    console.print("")
-                except KeyboardInterrupt:
-                    console.print("\n[dim]AI streaming interrupted by user[/dim]")
-                full = "".join(ai_text).strip()
-                if full:
-                    history.add_message(session_id, "assistant", full)
-            continue
+    while True:
+        try:
+            label = prompt_label(mode, prompt_style)
+            prefix = f"{label} > " if label else "> "
+            line = input(f"\n{prefix}").strip()
+        except (EOFError, KeyboardInterrupt):
+            console.print(_GOODBYE)
+            break
 
-        if parsed.kind == "text":
-            # Special: paginate concordance results when user types 'more'
-            if parsed.value.lower() == "more":
-                if last_results_cache.get("kind") == "concordance":
-                    items = last_results_cache.get("items", [])
-                    shown = last_results_cache.get("shown", 0)
-                    show_next = min(shown + 5, len(items))
-                    with console.status("Loading more matches…", spinner="dots"):
-                        pass
-                    print_concordance_results(last_results_cache.get("word", ""), items, show=show_next)
-                    last_results_cache["shown"] = show_next
-                    continue
-                if last_results_cache.get("kind") == "lexical":
-                    items = last_results_cache.get("items", [])
-                    shown = last_results_cache.get("shown", 0)
-                    show_next = min(shown + 10, len(items))
-                    with console.status("Loading more results…", spinner="dots"):
-                        pass
-                    print_keyword_results(last_results_cache.get("term", ""), items, show=show_next)
-                    last_results_cache["shown"] = show_next
-                    continue
-            q = parsed.value
-            # Mode-driven dispatch
-            if mode == "concordance":
-                word = q
-                if not typeahead.loaded:
-                    with console.status("Loading concordance index…", spinner="dots"):
-                        typeahead.load()
-                sugs = typeahead.suggest(word, limit=10)
-                print_suggestions([{"term": s.term, "count": s.count} for s in sugs])
-                with console.status("Scanning occurrences…", spinner="dots"):
-                    occ = typeahead.occurrences(word, limit=100)
-                print_concordance_results(word, occ, show=5)
-                last_results_cache = {"kind": "concordance", "word": word, "items": occ, "shown": 5}
-                history.add_message(session_id, "user", f"@{word}")
-                continue
-            if mode == "keyword":
-                term = q
-                with console.status("Keyword search…", spinner="dots"):
-                    items = db.lexical_search(term)
-                print_keyword_results(term, items, show=10)
-                last_results_cache = {"kind": "lexical", "term": term, "items": items, "shown": 10}
-                history.add_message(session_id, "user", f"!{term}")
-                continue
-            if mode == "verses":
-                ref = q
-                osid = osis.to_osis(ref)
-                if not osid:
-                    print_error("Could not parse verse reference. Try 'John 3:16'.")
-                    continue
-                with console.status("Retrieving verses…", spinner="dots"):
-                    verses = db.verse_lookup(osid)
-                if not verses:
-                    print_error(f"No verse found for {osid}")
-                    continue
-                print_verse_results([
-                    {"source": v.source, "osis_id": v.osis_id, "text": v.text} for v in verses
-                ])
-                history.add_message(session_id, "user", f"&{ref}")
-                continue
-            # In natural/topic, try to surface Strong's root for a primary keyword first
-            def _extract_primary_keyword(text: str) -> str:
-                stop = {"what","is","the","and","or","of","to","in","a","an","on","for","with","does","do","bible","about","according","who","why","how"}
-                toks = [t.strip(".,!?;:\"'()[]{}").lower() for t in text.split()]
-                cand = [t for t in toks if t.isalpha() and len(t) >= 3 and t not in stop]
-                # Prefer the first candidate
-                return cand[0] if cand else ""
-
-            if should_show_root_panel(q):
-                primary = _extract_primary_keyword(q)
-                if primary:
-                    nums = db.get_strongs_for_keyword(primary)
-                    if nums:
-                        entries = db.get_strongs_entries(nums)
-                        if entries:
-                            print_strongs_root(primary.upper(), entries)
-            # natural/topic path (both use routed_search with AI enhancement)
-            with console.status("Searching across sources…", spinner="dots"):
-                results = db.routed_search(q)
-            print_router_results(q, results, show=5)
-            history.add_message(session_id, "user", q if mode == "natural" else f"#{q}")
-            if ai_enabled and check_ollama():
-                ctx = "\n\n".join([f"[{i+1}] {r.get('content','')}" for i, r in enumerate(results[:5])])
-                prompt = (
-                    "You are a theological research assistant. Using ONLY the context provided, answer the query and cite sources by [index].\n\n"
-                    f"Context:\n{ctx}\n\nQuery: {q}\nAnswer:"
-                )
-                console.print("\n[bold green]AI-enhanced summary (streaming):[/bold green]")
-                ai_text = []
-                it = generate_stream(prompt, model=ai_model)
-                first_chunk: Optional[str] = None
-                with console.status(f"AI ({ai_model}) composing…", spinner="dots"):
-                    try:
-                        first_chunk = next(it)
-                    except StopIteration:
-                        first_chunk = None
-                    except KeyboardInterrupt:
-                        console.print("\n[dim]AI streaming interrupted by user[/dim]")
-                        first_chunk = None
-                if first_chunk:
-                    ai_text.append(first_chunk)
-                    console.print(first_chunk, end="")
-                try:
-                    for chunk in it:
-                        ai_text.append(chunk)
-                        console.print(chunk, end="")
-                    console.print("")
-                except KeyboardInterrupt:
-                    console.print("\n[dim]AI streaming interrupted by user[/dim]")
-                full = "".join(ai_text).strip()
-                if full:
-                    history.add_message(session_id, "assistant", full)
+        if not line:
             continue
 
+        try:
+            dispatch(line)
+        finally:
+            # Commit the turn's messages now: a crash, SIGKILL or closed terminal
+            # skips close(), and other instances should see this session
+            history.flush()
+
+    # Flush buffered history writes
+    history.close()
+
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from typing import Dict, Tuple, Optional
+import re
 import yaml
 from pathlib import Path
 
 from .config import OSIS_CONFIG_PATH
 
 
+# Reference parsing, compiled once ("1 John 3:16", "Gen1:1")
+_BOOK_DIGIT_RE = re.compile(r"([A-Za-z])([0-9])", re.ASCII)
+_SPACES_RE = re.compile(r"\s+")  # Unicode whitespace too, e.g. pasted NBSPs
+_REF_RE = re.compile(r"^(\d+\s+)?([A-Za-z.]+)\s+(\d+):(\d+)$", re.ASCII)
+
+
 class OsisHelper:
     """Parses textual references into OSIS ids using alias mapping."""
 
@@ -15,6 +22,7 @@ class OsisHelper:
         with self.path.open() as f:
             self.cfg = yaml.safe_load(f)
         self.aliases: Dict[str, str] = {k.lower(): v for k, v in (self.cfg.get("book_aliases") or {}).items()}
+        self._canonical = frozenset(self.aliases.values())
 
     @staticmethod
     def _pad(ch: int, v: int) -> Tuple[str, str]:
@@ -24,7 +32,7 @@ class OsisHelper:
         if not name:
             return None
         n = name.strip()
-        if n in self.aliases.values():
+        if n in self._canonical:
             return n
         return self.aliases.get(n.lower()) or n
 
@@ -32,10 +40,9 @@ class OsisHelper:
         if not text:
             return None
         t = text.strip().replace("&", "")
-        import re
-        t = re.sub(r"([A-Za-z])([0-9])", r"\1 \2", t)
-        t = re.sub(r"\s+", " ", t).strip()
-        m = re.match(r"^(\d+\s+)?([A-Za-z.]+)\s+(\d+):(\d+)$", t)
+        t = _BOOK_DIGIT_RE.sub(r"\1 \2", t)
+        t = _SPACES_RE.sub(" ", t).strip()
+        m = _REF_RE.match(t)
         if not m:
             return None
         book_num, book_name, ch, vs = m.groups()
@@ -33,13 +33,19 @@ def print_verse_results(results: List[Dict[str, Any]]) -> None:
     console.print(table)
 
 
-def print_concordance_results(word: str, items: List[Dict[str, Any]], show: int = 5) -> None:
-    title = f"Occurrences for @{word} (showing {min(show, len(items))} of {len(items)})"
+def _showing(start: int, show: int, total: int) -> str:
+    end = min(show, total)
+    return f"showing {start + 1}-{end} of {total}" if start else f"showing {end} of {total}"
+
+
+def print_concordance_results(word: str, items: List[Dict[str, Any]], show: int = 5, start: int = 0) -> None:
+    """Render items[start:show]; paging passes the previous show as start."""
+    title = f"Occurrences for @{word} ({_showing(start, show, len(items))})"
     console.print(Panel.fit(title, title="Concordance", style="bold blue"))
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("OSIS", style="cyan", no_wrap=True)
     table.add_column("Excerpt", style="white")
-    for item in items[:show]:
+    for item in items[start:show]:
         osis_id = (item.get("metadata") or {}).get("osis_id") or ""
         excerpt = item.get("content", "")
         table.add_row(osis_id, excerpt)
@@ -69,14 +75,15 @@ def print_error(msg: str) -> None:
     console.print(Panel.fit(Text(msg, style="bold red"), title="Error"))
 
 
-def print_keyword_results(term: str, items: List[Dict[str, Any]], show: int = 10) -> None:
-    title = f"Keyword search: '{term}' (showing {min(show, len(items))} of {len(items)})"
+def print_keyword_results(term: str, items: List[Dict[str, Any]], show: int = 10, start: int = 0) -> None:
+    """Render items[start:show]; paging passes the previous show as start."""
+    title = f"Keyword search: '{term}' ({_showing(start, show, len(items))})"
     console.print(Panel.fit(title, title="Keyword", style="bold cyan"))
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("OSIS", style="cyan", no_wrap=True)
     table.add_column("Src", style="yellow", no_wrap=True)
     table.add_column("Text", style="white")
-    for r in items[:show]:
+    for r in items[start:show]:
         table.add_row(r.get("osis_id", ""), r.get("source", ""), r.get("text", ""))
     console.print(table)
     if len(items) > show:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Dict
 import json
+import threading
 from pathlib import Path
 
 from .config import STRONGS_CONCORDANCE_JSON
@@ -22,6 +23,8 @@ class TypeaheadEngine:
         self._counts: Dict[str, int] = {}
         self._index: Dict[str, List[Dict]] = {}
         self._loaded = False
+        # load() may run on a startup thread while the prompt is already up
+        self._lock = threading.Lock()
 
     @property
     def loaded(self) -> bool:
@@ -30,16 +33,20 @@ class TypeaheadEngine:
     def load(self) -> None:
         if self._loaded:
             return
-        with self.path.open() as f:
-            data = json.load(f)
-        for item in data:
-            meta = item.get("metadata", {})
-            word = meta.get("word", "").lower()
-            if not word:
-                continue
-            self._counts[word] = self._counts.get(word, 0) + 1
-            self._index.setdefault(word, []).append(item)
-        self._loaded = True
+        with self._lock:
+            # A concurrent load finished while we waited
+            if self._loaded:
+                return
+            with self.path.open() as f:
+                data = json.load(f)
+            for item in data:
+                meta = item.get("metadata", {})
+                word = meta.get("word", "").lower()
+                if not word:
+                    continue
+                self._counts[word] = self._counts.get(word, 0) + 1
+                self._index.setdefault(word, []).append(item)
+            self._loaded = True
 
     def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
         if not self._loaded:
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Export static ChromaDB collections (verses, Strong's) to FAISS indexes.
+
+Writes vectordb/<name>.faiss plus vectordb/<name>.meta.pkl (ids, documents,
+metadatas, distance space). DatabaseManager serves a collection from these
+files when they exist, and from Chroma otherwise. Re-run after re-ingesting.
+"""
+
+import argparse
+import pickle
+from pathlib import Path
+
+import chromadb
+import faiss
+import numpy as np
+
+DB_PATH = "vectordb"
+STATIC_COLLECTIONS = [
+    "kjv_verses", "kjv_pericopes", "kjv_chapters",
+    "web_verses", "web_pericopes", "web_chapters",
+    "strongs_concordance_entries", "strongs_numbers", "strongs_word_summaries",
+]
+PAGE_SIZE = 5000
+HNSW_M = 32
+
+
+def fetch_all(col):
+    """Page through a collection: (ids, documents, metadatas, embeddings)."""
+    ids, docs, metas, vecs = [], [], [], []
+    offset = 0
+    while True:
+        got = col.get(include=["embeddings", "documents", "metadatas"], limit=PAGE_SIZE, offset=offset)
+        if not got["ids"]:
+            break
+        ids.extend(got["ids"])
+        docs.extend(got["documents"])
+        metas.extend(got["metadatas"])
+        vecs.append(np.asarray(got["embeddings"], dtype=np.float32))
+        offset += len(got["ids"])
+    return ids, docs, metas, (np.vstack(vecs) if vecs else np.zeros((0, 0), dtype=np.float32))
+
+
+def export_collection(client, name: str, out_dir: Path) -> None:
+    col = client.get_collection(name)
+    space = (col.metadata or {}).get("hnsw:space", "l2")
+    ids, docs, metas, vecs = fetch_all(col)
+    if not ids:
+        print(f"   ⚠️ {name}: empty, skipped")
+        return
+    # Same distances Chroma reports: squared L2, or 1 - inner product (cosine on unit vectors)
+    if space == "cosine":
+        faiss.normalize_L2(vecs)
+    metric = faiss.METRIC_L2 if space == "l2" else faiss.METRIC_INNER_PRODUCT
+    index = faiss.IndexHNSWFlat(vecs.shape[1], HNSW_M, metric)
+    index.add(vecs)
+    faiss.write_index(index, str(out_dir / f"{name}.faiss"))
+    with (out_dir / f"{name}.meta.pkl").open("wb") as f:
+        pickle.dump({"ids": ids, "documents": docs, "metadatas": metas, "space": space}, f, protocol=5)
+    print(f"   ✅ {name}: {len(ids):,} vectors ({space})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("collections", nargs="*", default=STATIC_COLLECTIONS)
+    parser.add_argument("--db-path", default=DB_PATH)
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=args.db_path)
+    out_dir = Path(args.db_path)
+    print("📦 Exporting collections to FAISS")
+    for name in args.collections:
+        try:
+            export_collection(client, name, out_dir)
+        except Exception as e:
+            print(f"   ❌ {name}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -327,7 +327,8 @@ class RetrievalRouter:
                    query: str,
                    retrieval_function,
                    hybrid_search_function: Optional[Callable[[str, str, int], List[Any]]] = None,
-                   rerank_function: Optional[Callable[[str, List[Any], int], List[Any]]] = None) -> List[SearchResult]:
+                   rerank_function: Optional[Callable[[str, List[Any], int], List[Any]]] = None,
+                   batch_retrieval_function: Optional[Callable[[List[str], str, int], Dict[str, List[Any]]]] = None) -> List[SearchResult]:
         """
         Main routing function - orchestrates the entire retrieval process
 
@@ -337,6 +338,10 @@ class RetrievalRouter:
                                Should accept (collection_name, query, k) and return results
             hybrid_search_function: Optional function for hybrid search (semantic + keyword)
             rerank_function: Optional function for cross-encoder reranking
+            batch_retrieval_function: Optional multi-collection vector search
+                               accepting (collection_names, query, k) and returning
+                               {collection_name: results}; used to issue every
+                               layer's searches up front instead of one by one
 
         Returns:
             Final ranked results ready for response generation
@@ -353,20 +358,41 @@ class RetrievalRouter:
         # Create retrieval plan
         plan = self.create_retrieval_plan(query)
         
+        # Use hybrid search for Bible verse layers (better for exact phrase matching)
+        bible_verse_collections = {'theology_verses', 'kjv_verses', 'web_verses', 'kjv_pericopes', 'web_pericopes'}
+
+        def per_collection_k(layer: str, collections: List[str]) -> int:
+            return max(1, plan.k_values[layer] // max(1, len(collections)))
+
+        # Vector searches are independent of each other; hand them all to the batch
+        # function (grouped by k) so it can embed once and query concurrently
+        prefetched: Dict[Tuple[str, int], List[Any]] = {}
+        if batch_retrieval_function is not None:
+            names_by_k: Dict[int, List[str]] = {}
+            for layer in plan.layers:
+                collections = self.layer_to_collections.get(layer, [layer])
+                k_col = per_collection_k(layer, collections)
+                for col in collections:
+                    if not (use_hybrid and col in bible_verse_collections):
+                        names_by_k.setdefault(k_col, []).append(col)
+            for k_col, names in names_by_k.items():
+                for col, sub_results in batch_retrieval_function(names, search_query, k_col).items():
+                    prefetched[(col, k_col)] = sub_results
+
         # Execute searches across layers
         results_by_layer = {}
         for layer in plan.layers:
-            k_for_layer = plan.k_values[layer]
             merged_results: List[SearchResult] = []
             collections = self.layer_to_collections.get(layer, [layer])
+            k_col = per_collection_k(layer, collections)
 
             for col in collections:
-                # Use hybrid search for Bible verse layers (better for exact phrase matching)
-                bible_verse_collections = {'theology_verses', 'kjv_verses', 'web_verses', 'kjv_pericopes', 'web_pericopes'}
                 if use_hybrid and col in bible_verse_collections and hybrid_search_function:
-                    sub_results = hybrid_search_function(search_query, col, max(1, k_for_layer // max(1, len(collections))))
+                    sub_results = hybrid_search_function(search_query, col, k_col)
+                elif (col, k_col) in prefetched:
+                    sub_results = prefetched[(col, k_col)]
                 else:
-                    sub_results = retrieval_function(col, search_query, max(1, k_for_layer // max(1, len(collections))))
+                    sub_results = retrieval_function(col, search_query, k_col)
 
                 # Convert to SearchResult format if needed
                 if sub_results and not isinstance(sub_results[0], SearchResult):
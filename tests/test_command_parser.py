@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Command parsing tests for the chat REPL: '@' Strong's references vs words
+"""
+
+import os
+import sys
+import unittest
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from chat_app.command_parser import parse_command, parse_strongs_ref
+
+
+class TestStrongsReferenceRouting(unittest.TestCase):
+    """'@' values are Strong's lookups only when they look like a Strong's number"""
+
+    def test_prefixed_numbers_are_strongs_lookups(self):
+        self.assertEqual(parse_strongs_ref("H1234"), "H1234")
+        self.assertEqual(parse_strongs_ref("G3056"), "G3056")
+        self.assertEqual(parse_strongs_ref("h175"), "h175")
+
+    def test_strong_colon_form(self):
+        self.assertEqual(parse_strongs_ref("strong:175"), "175")
+        self.assertEqual(parse_strongs_ref("Strong: H175"), "H175")
+
+    def test_words_starting_with_h_or_g_reach_the_concordance(self):
+        for word in ("hope", "Hope", "grace", "GOD", "h", "G", "H12a"):
+            self.assertIsNone(parse_strongs_ref(word), word)
+
+    def test_plain_words_and_empty(self):
+        self.assertIsNone(parse_strongs_ref("love"))
+        self.assertIsNone(parse_strongs_ref(""))
+
+    def test_at_line_value_feeds_reference_check(self):
+        parsed = parse_command("@hope")
+        self.assertEqual((parsed.kind, parsed.value), ("at", "hope"))
+        self.assertIsNone(parse_strongs_ref(parsed.value))
+        parsed = parse_command("@H1234")
+        self.assertEqual(parse_strongs_ref(parsed.value), "H1234")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Word summary parsing tests: the "Top Strong's" list behind the root panel
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from chat_app.database_manager import _word_summary_maps
+
+
+class TestWordSummaryStrongsNumbers(unittest.TestCase):
+    """Every comma-separated number is normalised, not just the first"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _maps(self, contents):
+        path = Path(self.temp_dir) / "word_summaries.json"
+        path.write_text(json.dumps([{"content": c, "metadata": {}} for c in contents]))
+        return _word_summary_maps(path)
+
+    def test_numbers_after_commas_keep_their_prefix(self):
+        word_to_strongs, _ = self._maps(["Word 'FAITH' — 245 occurrences. Top Strong's: G4102, G4100, G4103"])
+        self.assertEqual(list(word_to_strongs["FAITH"]), ["G4102", "G4100", "G4103"])
+        self.assertNotIn("HG4100", word_to_strongs["FAITH"])
+
+    def test_bare_numbers_default_to_hebrew(self):
+        word_to_strongs, _ = self._maps(["Word 'AARON' — Top Strong's: H175, 539 ,G3056"])
+        self.assertEqual(list(word_to_strongs["AARON"]), ["H175", "H539", "G3056"])
+
+    def test_summary_text_is_kept(self):
+        content = "Word 'grace' — Top Strong's: G5485"
+        word_to_strongs, docs = self._maps([content, "no summary here"])
+        self.assertEqual(list(word_to_strongs["GRACE"]), ["G5485"])
+        self.assertEqual(docs["GRACE"], content)
+        self.assertEqual(len(word_to_strongs), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()